@@ -17,6 +17,7 @@ setup(
         "grpcio>=1.57.0",
         "grpcio-tools>=1.57.0",
         "protobuf>=4.24.0",
+        "qasync>=0.27.0",
         "mysql-connector-python>=8.1.0",
         "oracledb>=1.4.0",
         "pymongo>=4.5.0",
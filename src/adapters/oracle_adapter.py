@@ -10,6 +10,11 @@ import oracledb
 from .base_adapter import BaseDBAdapter, DBConnection, TableSchema, QueryResult
 
 
+def oracle_dsn(host: str, port: int, service: Optional[str] = None) -> str:
+    """Build an Oracle Easy Connect string (host:port/service), defaulting to XE"""
+    return f"{host}:{port}/{service or 'XE'}"
+
+
 class OracleAdapter(BaseDBAdapter):
     """Oracle database adapter implementation"""
     
@@ -20,8 +25,8 @@ class OracleAdapter(BaseDBAdapter):
     def connect(self) -> bool:
         """Establish Oracle connection"""
         try:
-            # Configure Oracle connection
-            dsn = f"{self.connection.host}:{self.connection.port}/{self.connection.database}"
+            # The database field holds the service name
+            dsn = oracle_dsn(self.connection.host, self.connection.port, self.connection.database)
             
             self._conn = oracledb.connect(
                 user=self.connection.username,
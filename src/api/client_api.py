@@ -116,7 +116,8 @@ class ClientAPI:
             db_connection = DBConnection(
                 host=connection.get("host", "localhost"),
                 port=connection.get("port", 3306),
-                database=connection.get("database", ""),
+                # Oracle connections name their service instead of a database
+                database=connection.get("database") or connection.get("service_name") or connection.get("sid", ""),
                 username=connection.get("username", ""),
                 password=connection.get("password", ""),
                 connection_params=connection.get("connection_params")
@@ -200,6 +200,43 @@ class InsightPilotServer:
             self.logger.error(f"Failed to start server: {e}")
             raise
             
+    async def start_async(self):
+        """Start the gRPC server on the running asyncio event loop
+        
+        The servicer methods are synchronous, so they run on a worker pool
+        while the server itself lives on the caller's loop (the Qt loop in
+        standalone mode). Returns once the server is listening.
+        """
+        try:
+            self.service_impl = InsightPilotServiceImpl(self.config_manager)
+            
+            self.server = grpc.aio.server(
+                migration_thread_pool=futures.ThreadPoolExecutor(max_workers=10)
+            )
+            insightpilot_pb2_grpc.add_InsightPilotServiceServicer_to_server(
+                self.service_impl,
+                self.server
+            )
+            
+            listen_addr = f'{self.host}:{self.port}'
+            self.server.add_insecure_port(listen_addr)
+            await self.server.start()
+            
+            self.running = True
+            self.logger.info(f"gRPC server started on {listen_addr}")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to start server: {e}")
+            raise
+    
+    async def stop_async(self):
+        """Stop a server started with start_async()"""
+        if self.server and self.running:
+            self.logger.info("Stopping gRPC server!")
+            self.running = False
+            await self.server.stop(grace=5)
+            self.logger.info("gRPC server stopped")
+    
     def stop(self):
         """Stop the gRPC server"""
         if self.server and self.running:
@@ -10,18 +10,27 @@ from dataclasses import dataclass
 
 # Import enhanced client components
 from .providers.base_provider import LLMResponse
+from .providers.http_session import build_session
 from .enhanced_llm_client import EnhancedLLMClient
 from .llm_factory import LLMClientFactory
 
 
+# Keep-alive session shared by clients that are not given their own, so
+# consecutive calls to a server reuse one connection. No retries: a failed
+# health check should report straight away.
+_DEFAULT_SESSION = build_session(total_retries=0, pool_connections=4, pool_maxsize=4)
+
+
 class LLMClient:
     """Legacy LLM client for backward compatibility"""
     
-    def __init__(self, host: str = "localhost", port: int = 11434, model: str = "mistral:7b"):
+    def __init__(self, host: str = "localhost", port: int = 11434, model: str = "mistral:7b",
+                 session: Optional[requests.Session] = None):
         self.host = host
         self.port = port
         self.model = model
         self.base_url = f"http://{host}:{port}"
+        self.session = session or _DEFAULT_SESSION
         self.logger = logging.getLogger(__name__)
         
         # Default generation parameters
@@ -72,7 +81,7 @@ class LLMClient:
     def health_check(self) -> bool:
         """Check if Ollama server is running"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
             return response.status_code == 200
         except Exception as e:
             self.logger.error(f"Ollama health check failed: {e}")
@@ -81,17 +90,30 @@ class LLMClient:
     def list_models(self) -> Dict[str, Any]:
         """List available models"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=10)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=10)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
             self.logger.error(f"Failed to list models: {e}")
             return {"models": []}
     
+    def fetch_models(self) -> Optional[Dict[str, Any]]:
+        """List available models, or return None if the server is unreachable.
+        
+        One request answers both health_check() and list_models().
+        """
+        try:
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            self.logger.error(f"Ollama health check failed: {e}")
+            return None
+    
     def pull_model(self, model_name: str) -> bool:
         """Pull a model from Ollama registry"""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/pull",
                 json={"name": model_name},
                 timeout=300  # 5 minutes timeout for model download
@@ -101,24 +123,28 @@ class LLMClient:
             self.logger.error(f"Failed to pull model {model_name}: {e}")
             return False
     
+    def build_generate_payload(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Build the /api/generate request body for a prompt"""
+        # Merge default params with provided kwargs
+        params = {**self.default_params, **kwargs}
+        
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "options": {
+                "temperature": params.get("temperature", 0.1),
+                "top_p": params.get("top_p", 0.9),
+                "num_predict": params.get("max_tokens", 1000)
+            }
+        }
+    
     def generate(self, prompt: str, **kwargs) -> LLMResponse:
         """Generate text using the LLM"""
         try:
-            # Merge default params with provided kwargs
-            params = {**self.default_params, **kwargs}
-            
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": params.get("temperature", 0.1),
-                    "top_p": params.get("top_p", 0.9),
-                    "num_predict": params.get("max_tokens", 1000)
-                }
-            }
+            payload = self.build_generate_payload(prompt, **kwargs)
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
                 json=payload,
                 timeout=180  # Increased timeout for long LLM generations
@@ -147,7 +173,7 @@ class LLMClient:
         """Update the current model"""
         # Check if model exists
         models = self.list_models()
-        available_models = [model["name"] for model in models.get("models", [])]
+        available_models = {model["name"] for model in models.get("models", ())}
         
         if model_name not in available_models:
             self.logger.warning(f"Model {model_name} not found in available models")
@@ -166,7 +192,7 @@ class LLMClient:
         """Get information about a model"""
         target_model = model_name or self.model
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/show",
                 json={"name": target_model},
                 timeout=10
@@ -111,7 +111,7 @@ class LLMStartupThread(QThread):
             response = requests.get("http://localhost:11434/api/tags", timeout=10)
             if response.status_code == 200:
                 models = response.json()
-                available_models = [model["name"] for model in models.get("models", [])]
+                available_models = {model["name"] for model in models.get("models", ())}
                 return self.model_name in available_models
             return False
         except:
@@ -6,11 +6,13 @@ from .base_provider import BaseLLMProvider, LLMResponse
 from .ollama_provider import OllamaProvider
 from .openai_provider import OpenAIProvider
 from .github_copilot_provider import GitHubCopilotProvider
+from .http_session import RateLimitError
 
 __all__ = [
     'BaseLLMProvider',
     'LLMResponse', 
     'OllamaProvider',
     'OpenAIProvider',
-    'GitHubCopilotProvider'
+    'GitHubCopilotProvider',
+    'RateLimitError'
 ]
@@ -3,12 +3,63 @@ Base LLM Provider interface for supporting multiple LLM services
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, Union
+import dataclasses
 from dataclasses import dataclass
 import logging
+import re
+import sys
+import threading
+import time
 
+from .json_codec import loads
 
-@dataclass
+
+# Table headers emitted by PromptBuilder.format_schema_info
+_SCHEMA_TABLE_RE = re.compile(r"^### TABLE: (\S+) ###$", re.MULTILINE)
+
+# Canonical questions answered with a fixed, dialect-neutral SQL template.
+# Each pattern captures the table name, which must exist in the schema.
+_TEMPLATE_PATTERNS = (
+    (
+        re.compile(r"(?i)^\s*(?:count|number of) (?:the )?(?:rows|records) (?:in|of|from) (?:the )?(?:table )?[`\"]?(\w+)[`\"]?(?: table)?\s*[?.]?\s*$"),
+        "SELECT COUNT(*) AS row_count FROM {table}",
+    ),
+    (
+        re.compile(r"(?i)^\s*how many (?:rows|records) (?:are )?(?:there )?(?:in|does) (?:the )?(?:table )?[`\"]?(\w+)[`\"]?(?: table)?(?: have)?\s*\??\s*$"),
+        "SELECT COUNT(*) AS row_count FROM {table}",
+    ),
+)
+
+
+# Templates interpolate the table name unquoted, and the target dialect is
+# unknown here; only lowercase identifiers that aren't reserved in MySQL,
+# PostgreSQL or Oracle resolve to the same table everywhere. Anything else
+# is left to the LLM, which sees the dialect and can quote it.
+_PLAIN_IDENTIFIER_RE = re.compile(r"^[a-z_][a-z0-9_]*$")
+_RESERVED_WORDS = frozenset("""
+    access add all alter analyse analyze and any as asc audit between both by
+    call case cast check cluster column comment condition constraint create
+    cross current current_date current_time current_timestamp current_user
+    cursor database databases date declare default delete desc describe
+    distinct do drop each else end exclusive exists explain false fetch file
+    for foreign from full grant group having identified immediate in increment
+    index initial inner insert interval intersect into is join key keys
+    lateral leading left level like limit lock long match maxextents minus
+    mode modify natural noaudit nocompress not nowait null number of offline
+    offset on online only option or order outer partition primary privileges
+    public range rank raw read references rename resource returning revoke
+    right row rowid rownum rows select session set share show size smallint
+    start successful synonym sysdate table then to trailing trigger true uid
+    union unique update user using validate values varchar varchar2 view
+    when whenever where window with write
+""".split())
+
+# slots=True needs Python 3.10; older interpreters fall back to __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class LLMResponse:
     """Standardized LLM response structure"""
     content: str
@@ -18,27 +69,83 @@ class LLMResponse:
     tokens_used: Optional[int] = None
     response_time: Optional[float] = None
     provider: Optional[str] = None
+    # Seconds the server asked callers to wait after a rate-limited request
+    retry_after: Optional[float] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class LLMConfig:
     """Configuration for LLM providers"""
     provider: str
     model: str
     api_key: Optional[str] = None
-    base_url: Optional[str] = None
+    base_url: Optional[Union[str, List[str]]] = None
     temperature: float = 0.1
     max_tokens: int = 1000
     timeout: int = 180
     additional_params: Optional[Dict[str, Any]] = None
+    
+    def __post_init__(self):
+        # Only Ollama spreads requests over several hosts; other providers
+        # build URLs from a single string
+        if isinstance(self.base_url, (list, tuple)):
+            urls = list(self.base_url)
+            if len(urls) <= 1:
+                self.base_url = urls[0] if urls else None
+            elif self.provider != "ollama":
+                raise ValueError(f"Provider '{self.provider}' does not support multiple base URLs")
+            else:
+                self.base_url = urls
+
+
+# Names accepted as direct LLMConfig attributes by update_parameters
+_LLM_CONFIG_FIELDS = frozenset(f.name for f in dataclasses.fields(LLMConfig))
 
 
 class BaseLLMProvider(ABC):
     """Base class for all LLM providers"""
     
+    # Seconds before a cached status/model listing is refreshed in the background
+    CACHE_TTL = 30.0
+    
     def __init__(self, config: LLMConfig):
         self.config = config
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._call_cache: Dict[str, tuple] = {}
+        self._refreshing: set = set()
+        self._cache_lock = threading.Lock()
+    
+    def _cached_call(self, key: str, fetch, ttl: Optional[float] = None):
+        """Return a cached result, refreshing it in a background thread once stale.
+        
+        Only the very first call for a key blocks on the network; afterwards
+        callers get the last known value while a refresh runs. ``ttl``
+        defaults to CACHE_TTL.
+        """
+        ttl = self.CACHE_TTL if ttl is None else ttl
+        with self._cache_lock:
+            entry = self._call_cache.get(key)
+            if entry is not None:
+                timestamp, value = entry
+                if time.monotonic() - timestamp >= ttl and key not in self._refreshing:
+                    self._refreshing.add(key)
+                    threading.Thread(target=self._refresh_cached, args=(key, fetch), daemon=True).start()
+                return value
+        
+        value = fetch()
+        with self._cache_lock:
+            self._call_cache[key] = (time.monotonic(), value)
+        return value
+    
+    def _refresh_cached(self, key: str, fetch) -> None:
+        """Re-run a cached call and store its result"""
+        try:
+            value = fetch()
+            with self._cache_lock:
+                self._call_cache[key] = (time.monotonic(), value)
+        finally:
+            with self._cache_lock:
+                self._refreshing.discard(key)
         
     @abstractmethod
     def health_check(self) -> bool:
@@ -50,13 +157,71 @@ class BaseLLMProvider(ABC):
         """Generate text using the LLM"""
         pass
     
+    def generate_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Yield generated text incrementally as it arrives.
+
+        Providers without native streaming support yield the complete
+        response as a single chunk. Raises RuntimeError on failure.
+        """
+        response = self.generate(prompt, **kwargs)
+        if not response.success:
+            raise RuntimeError(response.error)
+        yield response.content
+    
+    @staticmethod
+    def _iter_sse_chunks(response: Any) -> Iterator[Dict[str, Any]]:
+        """Yield decoded server-sent event payloads until the [DONE] marker"""
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            yield loads(data)
+    
+    @staticmethod
+    def _delta_content(chunk: Dict[str, Any]) -> str:
+        """Extract the incremental text from a streamed chat completion chunk"""
+        choice = (chunk.get("choices") or (None,))[0] or {}
+        return (choice.get("delta") or {}).get("content") or ""
+    
     @abstractmethod
     def list_models(self) -> Dict[str, Any]:
         """List available models for this provider"""
         pass
     
+    @staticmethod
+    def _match_sql_template(schema_info: str, question: str) -> Optional[str]:
+        """Return templated SQL for canonical questions, or None to use the LLM.
+        
+        Tables whose names would need quoting in some dialect always go to
+        the LLM.
+        """
+        for pattern, template in _TEMPLATE_PATTERNS:
+            match = pattern.match(question)
+            if not match:
+                continue
+            wanted = match.group(1).lower()
+            for table in _SCHEMA_TABLE_RE.findall(schema_info):
+                if table.lower() != wanted:
+                    continue
+                if not _PLAIN_IDENTIFIER_RE.match(table) or table in _RESERVED_WORDS:
+                    return None
+                return template.format(table=table)
+        return None
+    
     def generate_sql(self, schema_info: str, question: str) -> LLMResponse:
         """Generate SQL query from schema and question using LLM"""
+        templated = self._match_sql_template(schema_info, question)
+        if templated is not None:
+            return LLMResponse(
+                content=templated,
+                success=True,
+                model=self.config.model,
+                response_time=0.0,
+                provider="template"
+            )
+        
         try:
             from llm.prompt_builder import PromptBuilder
         except ImportError:
@@ -116,6 +281,23 @@ class BaseLLMProvider(ABC):
         prompt = prompt_builder.build_explain_prompt(query)
         return self.generate(prompt)
     
+    def invalidate_cache(self) -> None:
+        """Drop cached health and model listings, e.g. after a credential change"""
+        with self._cache_lock:
+            self._call_cache.clear()
+    
+    def close(self) -> None:
+        """Release resources such as pooled HTTP connections"""
+        pass
+    
+    def warm_up(self) -> None:
+        """Open pooled connections ahead of the first request.
+        
+        Runs the health check by default, which reaches the same host as
+        generation for most providers and caches its own result.
+        """
+        self.health_check()
+    
     def update_model(self, model_name: str) -> bool:
         """Update the current model"""
         self.config.model = model_name
@@ -124,8 +306,10 @@ class BaseLLMProvider(ABC):
     def update_parameters(self, **params) -> None:
         """Update generation parameters"""
         for key, value in params.items():
-            if hasattr(self.config, key):
+            if key in _LLM_CONFIG_FIELDS:
                 setattr(self.config, key, value)
+                if key in ("api_key", "base_url"):
+                    self.invalidate_cache()
             elif self.config.additional_params is None:
                 self.config.additional_params = {key: value}
             else:
@@ -2,11 +2,45 @@
 GitHub Copilot LLM Provider implementation
 """
 
+import gzip
 import requests
 import time
-import json
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional, Tuple, Union
 from .base_provider import BaseLLMProvider, LLMResponse, LLMConfig
+from .http_session import build_session
+from .json_codec import dumps, loads
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Chat completions endpoint of the Azure-hosted GitHub Models service
+# Note: GitHub Copilot chat API is not publicly available
+AZURE_URL = "https://models.inference.ai.azure.com/chat/completions"
+
+# Request bodies larger than this many bytes are compressed before upload
+COMPRESS_THRESHOLD = 8192
+
+_COMPRESSORS = {
+    "zstd": lambda body: zstandard.ZstdCompressor(level=3).compress(body),
+    "gzip": lambda body: gzip.compress(body, compresslevel=6),
+}
+
+# Encoding to try next when the endpoint rejects the current one
+_ENCODING_FALLBACK = {"zstd": "gzip", "gzip": None}
+
+_PAT_UNSUPPORTED = "Personal Access Tokens are not supported"
+
+_UNAVAILABLE_NOTE = "Note: GitHub Copilot chat API is not publicly accessible for third-party applications."
+
+# User-facing explanations for the HTTP statuses the endpoint commonly returns
+_ERROR_MESSAGES: Dict[int, str] = {
+    400: "GitHub Copilot API request failed. The GitHub Copilot chat API is not publicly available for third-party applications. Please use OpenAI or Ollama providers instead.",
+    401: "GitHub Copilot API access denied. GitHub Copilot chat API requires special permissions and is not generally available. Please use OpenAI or Ollama providers instead.",
+    403: "GitHub Copilot API does not support Personal Access Tokens. The GitHub Copilot chat API is not publicly available for third-party applications. Please use OpenAI or Ollama providers instead.",
+}
 
 
 class GitHubCopilotProvider(BaseLLMProvider):
@@ -20,6 +54,18 @@ class GitHubCopilotProvider(BaseLLMProvider):
         "o1-mini"
     ]
     
+    # Map to models supported by Azure Models endpoint
+    MODEL_MAPPING = {
+        "gpt-4o": "gpt-4o",
+        "gpt-4o-mini": "gpt-4o-mini",
+        "claude-3.5-sonnet": "claude-3.5-sonnet",
+        "o1-preview": "o1-preview",
+        "o1-mini": "o1-mini"
+    }
+    
+    # Seconds a successful token validation is trusted before re-checking
+    TOKEN_VALIDATION_TTL = 300
+    
     def __init__(self, config: LLMConfig):
         super().__init__(config)
         self.api_key = config.api_key  # GitHub Personal Access Token
@@ -28,21 +74,61 @@ class GitHubCopilotProvider(BaseLLMProvider):
         
         if not self.api_key:
             raise ValueError("GitHub Personal Access Token is required for Copilot access")
+        
+        # Keep-alive session; 429s and failed connects are retried by the
+        # adapter, but a chat POST is never replayed after a 5xx or read
+        # timeout since the generation may already have run
+        self._session = build_session(retry_statuses=(429,), retry_reads=False)
+        
+        # Request templates built once; only dynamic fields are filled per call
+        self._bearer_headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        self._token_headers = {
+            "Authorization": f"token {self.api_key}",  # Use 'token' for GitHub API
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28"
+        }
+        self._system_message = {
+            "role": "system",
+            "content": "You are GitHub Copilot, an AI coding assistant. You excel at SQL queries, database analysis, and data insights. Provide accurate, efficient, and well-commented code."
+        }
+        # Everything up to the user message, serialized once; see _serialize_body
+        self._body_prefix = b'{"stream":true,"messages":[' + dumps(self._system_message) + b","
+        
+        # Request body compression, downgraded if the endpoint answers 415
+        self._request_encoding: Optional[str] = "zstd" if zstandard is not None else "gzip"
+        
+        # Monotonic deadline until which the token is known to be valid
+        self._token_valid_until = 0.0
+    
+    def close(self) -> None:
+        """Release pooled HTTP connections"""
+        self._session.close()
+    
+    def warm_up(self) -> None:
+        """Validate the token and connect to the chat endpoint.
+        
+        The token check goes to api.github.com while generation posts to
+        the Azure inference host, so the latter is opened separately.
+        """
+        self.health_check()
+        try:
+            self._session.head(AZURE_URL, timeout=5).close()
+        except requests.RequestException as e:
+            self.logger.debug(f"Could not pre-connect to the chat endpoint: {e}")
     
     def health_check(self) -> bool:
         """Check if GitHub Copilot API is accessible"""
+        if time.monotonic() < self._token_valid_until:
+            return True
+        
         try:
-            # First validate the GitHub token itself
-            headers = {
-                "Authorization": f"token {self.api_key}",  # Use 'token' instead of 'Bearer'
-                "Accept": "application/vnd.github+json",
-                "X-GitHub-Api-Version": "2022-11-28"
-            }
-            
-            # Test GitHub API access first
-            response = requests.get(
+            # Test GitHub API access first by validating the token itself
+            response = self._session.get(
                 "https://api.github.com/user",
-                headers=headers,
+                headers=self._token_headers,
                 timeout=10
             )
             
@@ -51,8 +137,9 @@ class GitHubCopilotProvider(BaseLLMProvider):
                 return False
             
             # Check if user has Copilot access
-            user_data = response.json()
+            user_data = loads(response.content)
             self.logger.info(f"GitHub token validated for user: {user_data.get('login', 'unknown')}")
+            self._token_valid_until = time.monotonic() + self.TOKEN_VALIDATION_TTL
             
             # For now, return True if GitHub token is valid
             # The actual Copilot API endpoint may require different authentication
@@ -64,20 +151,19 @@ class GitHubCopilotProvider(BaseLLMProvider):
     
     def list_models(self) -> Dict[str, Any]:
         """List available GitHub Copilot models"""
+        return self._cached_call("models", self._fetch_models)
+    
+    def _fetch_models(self) -> Dict[str, Any]:
+        """Fetch the model list from the GitHub Copilot API"""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/models",
-                headers=headers,
+                headers=self._bearer_headers,
                 timeout=10
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = loads(response.content)
                 return {"models": data}
             else:
                 # Return supported models as fallback
@@ -97,126 +183,150 @@ class GitHubCopilotProvider(BaseLLMProvider):
                 ]
             }
     
+    def _build_params(self, **kwargs) -> Dict[str, Any]:
+        """Build the per-call fields of a streaming chat completion payload"""
+        # Map the model to a compatible one
+        model_name = self.MODEL_MAPPING.get(self.config.model, "gpt-4o-mini")
+        
+        # Merge config params with provided kwargs
+        temperature = kwargs.get("temperature", self.config.temperature)
+        max_tokens = kwargs.get("max_tokens", self.config.max_tokens)
+        
+        params = {
+            "model": model_name,
+            "temperature": min(temperature, 1.0),  # Ensure temperature is within valid range
+            "max_tokens": min(max_tokens, 4096)    # Limit max tokens
+        }
+        
+        # Add optional parameters if they're reasonable values
+        top_p = kwargs.get("top_p", 0.95)
+        if 0 < top_p <= 1:
+            params["top_p"] = top_p
+        
+        return params
+    
+    def _serialize_body(self, prompt: str, params: Dict[str, Any]) -> bytes:
+        """Splice the pre-serialized system message with the per-call fields.
+        
+        ``params`` is never empty (it always carries the model), so dropping
+        the opening brace of its encoding leaves a valid tail for the object.
+        """
+        return self._body_prefix + dumps({"role": "user", "content": prompt}) + b"]," + dumps(params)[1:]
+    
+    def _encode_body(self, prompt: str, params: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+        """Serialize a request, compressing it when it is large enough to matter"""
+        body = self._serialize_body(prompt, params)
+        if self._request_encoding is None or len(body) <= COMPRESS_THRESHOLD:
+            return body, self._bearer_headers
+        
+        body = _COMPRESSORS[self._request_encoding](body)
+        return body, {**self._bearer_headers, "Content-Encoding": self._request_encoding}
+    
+    def _send_chat(self, body: bytes, headers: Dict[str, str]) -> requests.Response:
+        """POST one encoded chat completion body"""
+        return self._session.post(
+            AZURE_URL,
+            headers=headers,
+            data=body,
+            timeout=self.config.timeout,
+            stream=True
+        )
+    
+    def _post_chat(self, prompt: str, params: Dict[str, Any]) -> requests.Response:
+        """POST a streaming chat completion, downgrading compression on 415.
+        
+        Some endpoints reject Content-Encoding with a plain 400 instead; the
+        body is then resent uncompressed, and compression is only turned off
+        if that attempt gets past the 400.
+        """
+        while True:
+            body, headers = self._encode_body(prompt, params)
+            response = self._send_chat(body, headers)
+            if "Content-Encoding" not in headers or response.status_code not in (400, 415):
+                return response
+            
+            response.close()
+            if response.status_code == 415:
+                self.logger.info(f"Endpoint rejected {self._request_encoding} request bodies, falling back")
+                self._request_encoding = _ENCODING_FALLBACK[self._request_encoding]
+                continue
+            
+            response = self._send_chat(self._serialize_body(prompt, params), self._bearer_headers)
+            if response.status_code != 400:
+                self.logger.info(f"Endpoint rejected {self._request_encoding} request bodies, sending them plain")
+                self._request_encoding = None
+            return response
+    
+    def generate_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Yield generated text from GitHub Copilot as tokens arrive"""
+        params = self._build_params(**kwargs)
+        
+        with self._post_chat(prompt, params) as response:
+            response.raise_for_status()
+            for chunk in self._iter_sse_chunks(response):
+                text = self._delta_content(chunk)
+                if text:
+                    yield text
+    
+    @staticmethod
+    def _classify_error(error: Union[requests.Response, Exception]) -> str:
+        """Turn a failed response or request exception into a user-facing message"""
+        if isinstance(error, requests.Response):
+            message = _ERROR_MESSAGES.get(error.status_code)
+            if message:
+                return message
+            if _PAT_UNSUPPORTED in error.text:
+                return _ERROR_MESSAGES[403]
+            error = f"HTTP {error.status_code}: {error.text}"
+        return f"GitHub Copilot API unavailable: {error}. {_UNAVAILABLE_NOTE}"
+    
     def generate(self, prompt: str, **kwargs) -> LLMResponse:
         """Generate text using GitHub Copilot API"""
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
             # Important Note: GitHub Copilot's chat API is not publicly available
             # This implementation handles the current limitations gracefully
+            params = self._build_params(**kwargs)
             
-            # GitHub Copilot API endpoints and model mappings
-            # Map to models supported by Azure Models endpoint
-            model_mapping = {
-                "gpt-4o": "gpt-4o",
-                "gpt-4o-mini": "gpt-4o-mini", 
-                "claude-3.5-sonnet": "claude-3.5-sonnet",
-                "o1-preview": "o1-preview",
-                "o1-mini": "o1-mini"
-            }
-            
-            # Map the model to a compatible one
-            model_name = model_mapping.get(self.config.model, "gpt-4o-mini")
-            
-            # Merge config params with provided kwargs
-            temperature = kwargs.get("temperature", self.config.temperature)
-            max_tokens = kwargs.get("max_tokens", self.config.max_tokens)
-            
-            # Build messages for chat completion
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are GitHub Copilot, an AI coding assistant. You excel at SQL queries, database analysis, and data insights. Provide accurate, efficient, and well-commented code."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-            
-            payload = {
-                "model": model_name,
-                "messages": messages,
-                "temperature": min(temperature, 1.0),  # Ensure temperature is within valid range
-                "max_tokens": min(max_tokens, 4096),   # Limit max tokens
-                "stream": False
-            }
-            
-            # Add optional parameters if they're reasonable values
-            top_p = kwargs.get("top_p", 0.95)
-            if 0 < top_p <= 1:
-                payload["top_p"] = top_p
-            
-            # Try different endpoints with proper error handling
-            # Note: GitHub Copilot chat API is not publicly available
-            # These endpoints are for demonstration/testing purposes
-            endpoints_to_try = [
-                {
-                    "url": "https://models.inference.ai.azure.com/chat/completions",
-                    "headers": {
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    }
-                }
-            ]
-            
-            last_error = None
-            
-            for endpoint in endpoints_to_try:
-                try:
-                    response = requests.post(
-                        endpoint["url"],
-                        headers=endpoint["headers"],
-                        json=payload,
-                        timeout=self.config.timeout
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        response_time = time.time() - start_time
-                        
-                        # Extract content from response
-                        content = ""
-                        if "choices" in data and len(data["choices"]) > 0:
-                            content = data["choices"][0]["message"]["content"]
-                        
-                        # Extract token usage
-                        tokens_used = 0
-                        if "usage" in data:
-                            tokens_used = data["usage"].get("total_tokens", 0)
-                        
+            try:
+                with self._post_chat(prompt, params) as response:
+                    if response.status_code != 200:
                         return LLMResponse(
-                            content=content,
-                            success=True,
-                            model=data.get("model", model_name),
-                            tokens_used=tokens_used,
-                            response_time=response_time,
+                            content="",
+                            success=False,
+                            error=self._classify_error(response),
                             provider="github_copilot"
                         )
                     
-                    else:
-                        last_error = f"HTTP {response.status_code}: {response.text}"
-                        
-                except requests.exceptions.RequestException as e:
-                    last_error = str(e)
-                    continue
-            
-            # If we get here, all endpoints failed
-            if "Personal Access Tokens are not supported" in str(last_error):
-                error_msg = "GitHub Copilot API does not support Personal Access Tokens. The GitHub Copilot chat API is not publicly available for third-party applications. Please use OpenAI or Ollama providers instead."
-            elif "401" in str(last_error) or "Unauthorized" in str(last_error):
-                error_msg = "GitHub Copilot API access denied. GitHub Copilot chat API requires special permissions and is not generally available. Please use OpenAI or Ollama providers instead."
-            elif "400" in str(last_error) or "Bad Request" in str(last_error):
-                error_msg = "GitHub Copilot API request failed. The GitHub Copilot chat API is not publicly available for third-party applications. Please use OpenAI or Ollama providers instead."
-            else:
-                error_msg = f"GitHub Copilot API unavailable: {last_error}. Note: GitHub Copilot chat API is not publicly accessible for third-party applications."
-            
-            return LLMResponse(
-                content="",
-                success=False,
-                error=error_msg,
-                provider="github_copilot"
-            )
+                    parts = []
+                    model = params["model"]
+                    tokens_used = 0
+                    for chunk in self._iter_sse_chunks(response):
+                        parts.append(self._delta_content(chunk))
+                        model = chunk.get("model") or model
+                        # Usage is only reported on the final chunk, if at all
+                        usage = chunk.get("usage")
+                        if usage:
+                            tokens_used = usage.get("total_tokens", 0)
+                    response_time = time.monotonic() - start_time
+                    
+                    return LLMResponse(
+                        content="".join(parts),
+                        success=True,
+                        model=model,
+                        tokens_used=tokens_used,
+                        response_time=response_time,
+                        provider="github_copilot"
+                    )
+                    
+            except requests.exceptions.RequestException as e:
+                return LLMResponse(
+                    content="",
+                    success=False,
+                    error=self._classify_error(e),
+                    provider="github_copilot"
+                )
             
         except Exception as e:
             self.logger.error(f"Failed to generate text with GitHub Copilot: {e}")
@@ -230,15 +340,10 @@ class GitHubCopilotProvider(BaseLLMProvider):
     def get_rate_limits(self) -> Dict[str, Any]:
         """Get current rate limit status"""
         try:
-            headers = {
-                "Authorization": f"token {self.api_key}",  # Use 'token' for GitHub API
-                "Accept": "application/vnd.github+json"
-            }
-            
             # Make a lightweight request to check rate limits
-            response = requests.get(
+            response = self._session.get(
                 "https://api.github.com/user",
-                headers=headers,
+                headers=self._token_headers,
                 timeout=5
             )
             
@@ -257,19 +362,21 @@ class GitHubCopilotProvider(BaseLLMProvider):
     
     def validate_token(self) -> bool:
         """Validate GitHub Personal Access Token"""
+        if time.monotonic() < self._token_valid_until:
+            return True
+        
         try:
-            headers = {
-                "Authorization": f"token {self.api_key}",  # Use 'token' for GitHub API
-                "Accept": "application/vnd.github+json"
-            }
-            
-            response = requests.get(
+            response = self._session.get(
                 "https://api.github.com/user",
-                headers=headers,
+                headers=self._token_headers,
                 timeout=10
             )
             
-            return response.status_code == 200
+            if response.status_code != 200:
+                return False
+            
+            self._token_valid_until = time.monotonic() + self.TOKEN_VALIDATION_TTL
+            return True
             
         except Exception as e:
             self.logger.error(f"Token validation failed: {e}")
@@ -0,0 +1,90 @@
+"""
+Shared HTTP session construction for LLM providers
+"""
+
+import time
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Statuses that indicate a transient failure worth retrying
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def build_session(
+    total_retries: int = 3,
+    backoff_factor: float = 0.5,
+    allowed_methods: Iterable[str] = ("GET", "POST"),
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    retry_statuses: Iterable[int] = RETRY_STATUSES,
+    retry_reads: bool = True,
+) -> requests.Session:
+    """Create a keep-alive session that retries transient failures.
+
+    Retries happen inside urllib3 with exponential backoff and honour
+    ``Retry-After``. Once retries are exhausted the last response is
+    returned rather than raised, so callers can still inspect its status.
+    For requests that must not run twice, pass ``retry_statuses=(429,)``
+    and ``retry_reads=False`` so only answers the server rejected outright
+    and connections that never reached it are retried.
+    """
+    retry = Retry(
+        total=total_retries,
+        read=None if retry_reads else 0,
+        backoff_factor=backoff_factor,
+        status_forcelist=tuple(retry_statuses),
+        allowed_methods=frozenset(allowed_methods),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class RateLimitError(requests.HTTPError):
+    """Raised when a server still answers 429 once retries are exhausted.
+    
+    ``retry_after`` holds the server's requested delay in seconds, or None
+    when it did not send a usable Retry-After header.
+    """
+    
+    def __init__(self, retry_after: Optional[float] = None, response: Optional[requests.Response] = None):
+        message = "Rate limit exceeded"
+        if retry_after is not None:
+            message += f", retry after {retry_after:g}s"
+        super().__init__(message, response=response)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Convert a Retry-After header (seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def raise_for_status(response: requests.Response) -> None:
+    """Like Response.raise_for_status(), but 429 raises RateLimitError"""
+    if response.status_code == 429:
+        raise RateLimitError(parse_retry_after(response.headers.get("Retry-After")), response=response)
+    response.raise_for_status()
@@ -0,0 +1,33 @@
+"""
+JSON encoding helpers for provider HTTP traffic
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Both helpers work with bytes so the result can be passed
+directly as a request body.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Header to send alongside a body produced by dumps()
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize an object to a UTF-8 encoded JSON request body"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse a JSON document from a response body or stream line"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
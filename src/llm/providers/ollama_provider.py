@@ -2,21 +2,41 @@
 Ollama LLM Provider implementation
 """
 
+import itertools
 import requests
 import time
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List
 from .base_provider import BaseLLMProvider, LLMResponse, LLMConfig
+from .json_codec import JSON_HEADERS, dumps, loads
 
 
 class OllamaProvider(BaseLLMProvider):
     """Ollama LLM provider for local models"""
     
+    # How long Ollama keeps the model resident after a request
+    KEEP_ALIVE = "10m"
+    
+    # Default number of concurrent requests issued by generate_batch
+    DEFAULT_PARALLEL = 4
+    
     def __init__(self, config: LLMConfig):
         super().__init__(config)
-        self.base_url = config.base_url or f"http://localhost:11434"
+        # base_url may list several Ollama hosts; generations are spread round-robin
+        base_url = config.base_url or f"http://localhost:11434"
+        self._urls: List[str] = [base_url] if isinstance(base_url, str) else list(base_url)
+        self._rr = itertools.cycle(self._urls)
+        self.base_url = self._urls[0]
+        
+        # Static part of every /api/generate payload, built once
+        self._payload_skeleton = {"stream": True, "keep_alive": self.KEEP_ALIVE}
         
     def health_check(self) -> bool:
         """Check if Ollama server is running"""
+        return self._cached_call("health", self._fetch_health)
+    
+    def _fetch_health(self) -> bool:
+        """Query the Ollama server for liveness"""
         try:
             response = requests.get(f"{self.base_url}/api/tags", timeout=5)
             return response.status_code == 200
@@ -26,10 +46,14 @@ class OllamaProvider(BaseLLMProvider):
     
     def list_models(self) -> Dict[str, Any]:
         """List available Ollama models"""
+        return self._cached_call("models", self._fetch_models)
+    
+    def _fetch_models(self) -> Dict[str, Any]:
+        """Fetch the model list from the Ollama server"""
         try:
             response = requests.get(f"{self.base_url}/api/tags", timeout=10)
             response.raise_for_status()
-            return response.json()
+            return loads(response.content)
         except requests.RequestException as e:
             self.logger.error(f"Failed to list Ollama models: {e}")
             return {"models": []}
@@ -47,42 +71,66 @@ class OllamaProvider(BaseLLMProvider):
             self.logger.error(f"Failed to pull model {model_name}: {e}")
             return False
     
+    def _stream_chunks(self, prompt: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        """Yield decoded NDJSON chunks from a streaming /api/generate call"""
+        # Merge config params with provided kwargs
+        temperature = kwargs.get("temperature", self.config.temperature)
+        max_tokens = kwargs.get("max_tokens", self.config.max_tokens)
+        top_p = kwargs.get("top_p", 0.9)
+        
+        payload = {
+            **self._payload_skeleton,
+            "model": self.config.model,
+            "prompt": prompt,
+            "options": {
+                "temperature": temperature,
+                "top_p": top_p,
+                "num_predict": max_tokens
+            }
+        }
+        
+        with requests.post(
+            f"{next(self._rr)}/api/generate",
+            data=dumps(payload),
+            headers=JSON_HEADERS,
+            timeout=self.config.timeout,
+            stream=True
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = loads(line)
+                if "error" in chunk:
+                    raise RuntimeError(chunk["error"])
+                yield chunk
+    
+    def generate_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Yield generated text from Ollama as tokens arrive"""
+        for chunk in self._stream_chunks(prompt, **kwargs):
+            text = chunk.get("response")
+            if text:
+                yield text
+    
     def generate(self, prompt: str, **kwargs) -> LLMResponse:
         """Generate text using Ollama"""
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
-            # Merge config params with provided kwargs
-            temperature = kwargs.get("temperature", self.config.temperature)
-            max_tokens = kwargs.get("max_tokens", self.config.max_tokens)
-            top_p = kwargs.get("top_p", 0.9)
+            parts = []
+            data = {}
+            for data in self._stream_chunks(prompt, **kwargs):
+                parts.append(data.get("response", ""))
             
-            payload = {
-                "model": self.config.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "top_p": top_p,
-                    "num_predict": max_tokens
-                }
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=self.config.timeout
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            response_time = time.time() - start_time
+            # The final chunk (done=true) carries the model name and token counts
+            response_time = time.monotonic() - start_time
+            get = data.get
             
             return LLMResponse(
-                content=data.get("response", ""),
+                content="".join(parts),
                 success=True,
-                model=data.get("model"),
-                tokens_used=data.get("prompt_eval_count", 0) + data.get("eval_count", 0),
+                model=get("model"),
+                tokens_used=get("prompt_eval_count", 0) + get("eval_count", 0),
                 response_time=response_time,
                 provider="ollama"
             )
@@ -96,17 +144,33 @@ class OllamaProvider(BaseLLMProvider):
                 provider="ollama"
             )
     
+    def generate_batch(self, prompts: List[str], **kwargs) -> List[LLMResponse]:
+        """Generate responses for several prompts concurrently.
+        
+        Concurrency is taken from ``additional_params["parallel"]``; results
+        are returned in the same order as ``prompts``.
+        """
+        if not prompts:
+            return []
+        
+        params = self.config.additional_params or {}
+        max_workers = max(1, min(int(params.get("parallel", self.DEFAULT_PARALLEL)), len(prompts)))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda prompt: self.generate(prompt, **kwargs), prompts))
+    
     def get_model_info(self, model_name: str = None) -> Dict[str, Any]:
         """Get information about an Ollama model"""
         target_model = model_name or self.config.model
         try:
             response = requests.post(
                 f"{self.base_url}/api/show",
-                json={"name": target_model},
+                data=dumps({"name": target_model}),
+                headers=JSON_HEADERS,
                 timeout=10
             )
             response.raise_for_status()
-            return response.json()
+            return loads(response.content)
         except requests.RequestException as e:
             self.logger.error(f"Failed to get model info for {target_model}: {e}")
             return {}
@@ -2,24 +2,151 @@
 OpenAI/ChatGPT LLM Provider implementation
 """
 
+import asyncio
+import numpy as np
 import requests
+import threading
 import time
-import json
-from typing import Dict, Any, List
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Generator, List, Optional, Tuple
 from .base_provider import BaseLLMProvider, LLMResponse, LLMConfig
+from .http_session import RateLimitError, build_session, raise_for_status
+from .json_codec import dumps, loads
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+# Token pricing per 1K tokens as (input, output), as of 2024
+_PRICING: Dict[str, Tuple[float, float]] = {
+    "gpt-4": (0.03, 0.06),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4o": (0.005, 0.015),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-3.5-turbo": (0.0015, 0.002),
+    "gpt-3.5-turbo-16k": (0.003, 0.004),
+}
+
+# Stable system preamble shared by every chat request. OpenAI only caches
+# prompt prefixes of 1024 tokens or more, so this text is deliberately long
+# and must stay byte-identical between calls: never interpolate timestamps,
+# request ids or schema details here.
+_SYSTEM_PROMPT = """You are an expert SQL analyst and database query assistant. Provide clear, accurate, and efficient SQL queries.
+
+### ROLE ###
+You help analysts explore relational and document databases by translating natural language questions into queries, explaining existing queries, and suggesting improvements. The user message always carries the schema, the question and any task-specific instructions. Follow those instructions exactly; the guidance below only applies where the user message is silent.
+
+### GENERAL SQL GUIDANCE ###
+1. Generate read-only queries. Never emit DDL or DML such as CREATE, ALTER, DROP, TRUNCATE, INSERT, UPDATE, DELETE, MERGE, GRANT or REVOKE, even if the question asks for it.
+2. Only reference tables and columns that appear in the supplied schema. If the schema does not contain what the question needs, say so instead of inventing names.
+3. Prefer explicit column lists over SELECT * unless the question asks for every column.
+4. Always alias tables in multi-table queries and qualify every column with its alias.
+5. Use explicit JOIN ... ON syntax rather than comma joins with join conditions in the WHERE clause.
+6. Choose INNER JOIN when rows must exist on both sides and LEFT JOIN when the question asks to include rows without a match.
+7. Every non-aggregated column in the SELECT list must appear in the GROUP BY clause.
+8. Filter raw rows with WHERE and aggregated results with HAVING.
+9. Do not reference a SELECT alias from the WHERE or HAVING clause of the same query level; repeat the expression or wrap the query instead.
+10. Compute percentages as (part / total) * 100, deriving the total from a scalar subquery in the SELECT list or from a window function, and guard against division by zero with NULLIF.
+11. Limit result sets to a reasonable size (at most 1000 rows) unless the question explicitly asks for everything. Row limits must be literal integers.
+12. Order results deterministically when the question implies ranking, recency or "top N" semantics.
+13. Compare dates with half-open ranges (column >= start AND column < end) instead of applying functions to indexed columns.
+14. Treat NULL carefully: use IS NULL / IS NOT NULL, and remember that COUNT(column) skips NULL values while COUNT(*) does not.
+15. Prefer EXISTS over IN for correlated existence checks against large tables.
+16. Avoid deeply nested subqueries that reference aggregates of an outer query; use common table expressions or derived tables when the dialect supports them.
+
+### MYSQL NOTES ###
+- Quote identifiers that contain special characters or reserved words with backticks.
+- Use LIMIT n for row limits, and LIMIT n OFFSET m for paging.
+- Use DATE_FORMAT, DATE_SUB, DATE_ADD and CURDATE for date arithmetic.
+- String concatenation uses CONCAT(a, b); the || operator is not portable.
+- GROUP_CONCAT aggregates strings within a group.
+
+### ORACLE NOTES ###
+- Quote identifiers with double quotes only when they are case sensitive or reserved.
+- Use FETCH FIRST n ROWS ONLY (12c and later) or ROWNUM filters in an outer query for row limits; never use LIMIT.
+- Use TRUNC, ADD_MONTHS, SYSDATE and TO_DATE for date arithmetic, and TO_CHAR for formatting.
+- String concatenation uses the || operator.
+- There is no boolean column type; compare flags against their stored values.
+- Select from DUAL when a query has no table.
+
+### MONGODB NOTES ###
+- Express queries as aggregation pipelines using stages such as $match, $project, $group, $sort, $limit, $lookup and $unwind.
+- Place $match stages as early as possible so indexes can be used.
+- Always finish unbounded pipelines with a $limit stage (at most 1000 documents).
+- Use $sum, $avg, $min, $max and $count inside $group, and $dateToString for date bucketing.
+
+### EXPLANATIONS AND OPTIMIZATION ###
+When asked to explain a query, describe its purpose first, then walk through each clause in execution order (FROM and JOINs, WHERE, GROUP BY, HAVING, SELECT, ORDER BY, LIMIT) and finish with caveats about NULL handling, duplicates or performance. When asked to optimize a query, keep its results identical, explain every change, and mention indexes that would help along with the columns they should cover. Point out full table scans, functions applied to indexed columns, implicit type conversions, SELECT * on wide tables and unbounded result sets.
+
+### OUTPUT FORMAT ###
+- When the user asks for a query only, reply with the bare query: no Markdown fences, no commentary, no trailing explanation.
+- When the user asks for an explanation, use short paragraphs or numbered lists and wrap any SQL in fenced code blocks.
+- When the user asks for JSON, reply with a single valid JSON document and nothing else.
+- Never include credentials, connection strings or data that was not supplied in the conversation.
+
+### EXAMPLES ###
+Question: How many orders were placed in 2023?
+Query: SELECT COUNT(*) AS order_count FROM orders o WHERE o.order_date >= '2023-01-01' AND o.order_date < '2024-01-01'
+
+Question: Which five customers spent the most?
+Query: SELECT c.customer_id, c.name, SUM(o.total) AS total_spent FROM customers c JOIN orders o ON o.customer_id = c.customer_id GROUP BY c.customer_id, c.name ORDER BY total_spent DESC LIMIT 5
+
+Question: What share of revenue does each product category contribute?
+Query: SELECT p.category, SUM(oi.amount) AS revenue, SUM(oi.amount) / NULLIF((SELECT SUM(amount) FROM order_items), 0) * 100 AS revenue_pct FROM order_items oi JOIN products p ON p.product_id = oi.product_id GROUP BY p.category ORDER BY revenue DESC LIMIT 100"""
+
+# Rough characters-per-token ratio used when tiktoken is not installed
+_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _encoding_for(model: str):
+    """Return the tiktoken encoding for a model, defaulting to cl100k_base"""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+# Per-call overrides accepted by _build_payload
+_ALLOWED_KW = frozenset({
+    "temperature", "max_tokens", "top_p", "frequency_penalty", "presence_penalty"
+})
+
+# Sent as response_format when a caller asks for json_mode
+_JSON_RESPONSE_FORMAT = {"type": "json_object"}
 
 
 class OpenAIProvider(BaseLLMProvider):
     """OpenAI/ChatGPT LLM provider"""
     
-    SUPPORTED_MODELS = [
+    SUPPORTED_MODELS = frozenset({
         "gpt-4",
         "gpt-4-turbo",
         "gpt-4o",
         "gpt-4o-mini",
         "gpt-3.5-turbo",
         "gpt-3.5-turbo-16k"
-    ]
+    })
+    
+    # Seconds before cached health / model listings are refreshed
+    HEALTH_CACHE_TTL = 60.0
+    MODELS_CACHE_TTL = 300.0
+    
+    # Batch API jobs are billed at this fraction of the synchronous price
+    BATCH_DISCOUNT = 0.5
+    
+    # Prompt-cache hits are billed at this fraction of the input price
+    CACHED_INPUT_DISCOUNT = 0.5
+    
+    BATCH_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
     
     def __init__(self, config: LLMConfig):
         super().__init__(config)
@@ -28,42 +155,88 @@ class OpenAIProvider(BaseLLMProvider):
         
         if not self.api_key:
             raise ValueError("OpenAI API key is required")
+        
+        # Keep-alive session so repeated calls reuse the TLS connection
+        self._auth_headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        # Pool sized for Tier-1 concurrency; 429s back off per Retry-After.
+        # Completions aren't idempotent, so a 5xx or read timeout is never
+        # replayed: the server may already have generated (and billed) it
+        self._session = build_session(
+            total_retries=5,
+            backoff_factor=1.0,
+            allowed_methods=("GET", "POST", "HEAD"),
+            pool_connections=8,
+            pool_maxsize=32,
+            retry_statuses=(429,),
+            retry_reads=False
+        )
+        self._session.headers.update(self._auth_headers)
+        
+        # Batch file uploads and job creation aren't idempotent: a 5xx or
+        # timeout after the server accepted one would bill a duplicate job
+        self._batch_session = build_session(
+            total_retries=5,
+            backoff_factor=1.0,
+            allowed_methods=("POST",),
+            pool_connections=1,
+            pool_maxsize=2,
+            retry_statuses=(429,),
+            retry_reads=False
+        )
+        self._batch_session.headers.update(self._auth_headers)
+        
+        self._system_message = {"role": "system", "content": _SYSTEM_PROMPT}
+        self._build_payload_template()
+        
+        # Identical concurrent generate() calls share one in-flight request
+        self._inflight: Dict[tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+    
+    def close(self) -> None:
+        """Release pooled HTTP connections"""
+        self._session.close()
+        self._batch_session.close()
     
     def health_check(self) -> bool:
         """Check if OpenAI API is accessible"""
+        return self._cached_call("health", self._fetch_health, self.HEALTH_CACHE_TTL)
+    
+    def _fetch_health(self) -> bool:
+        """Query the OpenAI API for reachability"""
+        url = f"{self.base_url}/models"
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
+            # HEAD authenticates without transferring the model list
+            response = self._session.head(url, timeout=5)
+            status = response.status_code
+            # Auth failures and 2xx/3xx/5xx answers are conclusive; other 4xx
+            # and 501 may just mean a proxy or compatible server rejects HEAD
+            if status in (401, 403) or not (400 <= status < 500 or status == 501):
+                return status == 200
             
-            response = requests.get(
-                f"{self.base_url}/models",
-                headers=headers,
-                timeout=10
-            )
-            
-            return response.status_code == 200
+            # HEAD rejected: fall back to GET but never read the body
+            with self._session.get(url, timeout=5, stream=True) as response:
+                return response.status_code == 200
         except Exception as e:
             self.logger.error(f"OpenAI health check failed: {e}")
             return False
     
     def list_models(self) -> Dict[str, Any]:
         """List available OpenAI models"""
+        return self._cached_call("models", self._fetch_models, self.MODELS_CACHE_TTL)
+    
+    def _fetch_models(self) -> Dict[str, Any]:
+        """Fetch the supported model list from the OpenAI API"""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/models",
-                headers=headers,
                 timeout=10
             )
-            response.raise_for_status()
+            raise_for_status(response)
             
-            data = response.json()
+            data = loads(response.content)
             # Filter to only supported models
             supported_models = [
                 model for model in data.get("data", [])
@@ -76,71 +249,192 @@ class OpenAIProvider(BaseLLMProvider):
             self.logger.error(f"Failed to list OpenAI models: {e}")
             return {"models": []}
     
+    def _build_payload_template(self) -> None:
+        """Precompute the parts of the request body that only change with config"""
+        self._payload_template = {
+            "model": self.config.model,
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+            "top_p": 1.0,
+            "frequency_penalty": 0.0,
+            "presence_penalty": 0.0
+        }
+    
+    def update_model(self, model_name: str) -> bool:
+        """Update the current model"""
+        updated = super().update_model(model_name)
+        self._build_payload_template()
+        return updated
+    
+    def update_parameters(self, **params) -> None:
+        """Update generation parameters"""
+        super().update_parameters(**params)
+        self._build_payload_template()
+    
+    def _build_payload(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Build a chat completion payload"""
+        payload = self._payload_template.copy()
+        payload["messages"] = (self._system_message, {"role": "user", "content": prompt})
+        if kwargs:
+            payload.update({key: value for key, value in kwargs.items() if key in _ALLOWED_KW})
+        if kwargs.get("json_mode"):
+            payload["response_format"] = _JSON_RESPONSE_FORMAT
+        return payload
+    
+    def _parse_completion(self, data: Dict[str, Any], start_time: Optional[float] = None) -> LLMResponse:
+        """Convert a chat completion response body into an LLMResponse.
+        
+        response_time is left unset when no start_time is given.
+        """
+        response_time = None if start_time is None else time.perf_counter() - start_time
+        
+        # Extract content and token usage from response
+        choice = (data.get("choices") or (None,))[0] or {}
+        content = choice.get("message", {}).get("content") or ""
+        tokens_used = (data.get("usage") or {}).get("total_tokens", 0)
+        
+        return LLMResponse(
+            content=content,
+            success=True,
+            model=data.get("model"),
+            tokens_used=tokens_used,
+            response_time=response_time,
+            provider="openai"
+        )
+    
     def generate(self, prompt: str, **kwargs) -> LLMResponse:
-        """Generate text using OpenAI API"""
-        start_time = time.time()
+        """Generate text using OpenAI API.
         
+        Concurrent calls with the same model, prompt and parameters wait
+        for the first one and share its response. Calls with unhashable
+        parameters (lists, dicts) are sent without coalescing.
+        """
+        key = (self.config.model, prompt, tuple(sorted(kwargs.items())))
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            # Merge config params with provided kwargs
-            temperature = kwargs.get("temperature", self.config.temperature)
-            max_tokens = kwargs.get("max_tokens", self.config.max_tokens)
-            
-            # Build messages for chat completion
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are an expert SQL analyst and database query assistant. Provide clear, accurate, and efficient SQL queries."
-                },
-                {
-                    "role": "user", 
-                    "content": prompt
-                }
-            ]
-            
-            payload = {
-                "model": self.config.model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens,
-                "top_p": kwargs.get("top_p", 1.0),
-                "frequency_penalty": kwargs.get("frequency_penalty", 0.0),
-                "presence_penalty": kwargs.get("presence_penalty", 0.0)
-            }
-            
-            response = requests.post(
+            hash(key)
+        except TypeError:
+            return self._request_completion(prompt, **kwargs)
+        
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        
+        if not owner:
+            return future.result()
+        
+        try:
+            response = self._request_completion(prompt, **kwargs)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    def _request_completion(self, prompt: str, **kwargs) -> LLMResponse:
+        """Send one chat completion request"""
+        start_time = time.perf_counter()
+        
+        try:
+            response = self._session.post(
                 f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
+                data=dumps(self._build_payload(prompt, **kwargs)),
                 timeout=self.config.timeout
             )
-            response.raise_for_status()
-            
-            data = response.json()
-            response_time = time.time() - start_time
+            raise_for_status(response)
             
-            # Extract content from response
-            content = ""
-            if "choices" in data and len(data["choices"]) > 0:
-                content = data["choices"][0]["message"]["content"]
-            
-            # Extract token usage
-            tokens_used = 0
-            if "usage" in data:
-                tokens_used = data["usage"].get("total_tokens", 0)
+            return self._parse_completion(loads(response.content), start_time)
             
+        except RateLimitError as e:
+            self.logger.warning(f"OpenAI rate limit reached: {e}")
             return LLMResponse(
-                content=content,
-                success=True,
-                model=data.get("model"),
-                tokens_used=tokens_used,
-                response_time=response_time,
+                content="",
+                success=False,
+                error=str(e),
+                provider="openai",
+                retry_after=e.retry_after
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to generate text with OpenAI: {e}")
+            return LLMResponse(
+                content="",
+                success=False,
+                error=str(e),
                 provider="openai"
             )
+    
+    def generate_stream(self, prompt: str, **kwargs) -> Generator[str, None, LLMResponse]:
+        """Yield generated text from OpenAI as tokens arrive.
+        
+        The generator's return value is the final LLMResponse (retrieve it
+        with ``yield from`` or from StopIteration); usage is requested via
+        ``stream_options`` so token counts match the non-streaming path.
+        Raises on HTTP errors like the other streaming providers.
+        """
+        start_time = time.perf_counter()
+        payload = self._build_payload(prompt, **kwargs)
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+        
+        with self._session.post(
+            f"{self.base_url}/chat/completions",
+            data=dumps(payload),
+            timeout=self.config.timeout,
+            stream=True
+        ) as response:
+            raise_for_status(response)
+            
+            parts = []
+            model = payload["model"]
+            tokens_used = 0
+            for chunk in self._iter_sse_chunks(response):
+                model = chunk.get("model") or model
+                # Usage arrives on a final chunk with an empty choices list
+                usage = chunk.get("usage")
+                if usage:
+                    tokens_used = usage.get("total_tokens", 0)
+                text = self._delta_content(chunk)
+                if text:
+                    parts.append(text)
+                    yield text
+        
+        return LLMResponse(
+            content="".join(parts),
+            success=True,
+            model=model,
+            tokens_used=tokens_used,
+            response_time=time.perf_counter() - start_time,
+            provider="openai"
+        )
+    
+    async def agenerate(self, prompt: str, session: Optional["aiohttp.ClientSession"] = None, **kwargs) -> LLMResponse:
+        """Generate text using OpenAI API without blocking the event loop.
+        
+        Pass ``session`` to share one connection pool across many calls;
+        otherwise a short-lived session is created for this request.
+        """
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for async generation. Please install aiohttp.")
+        
+        owns_session = session is None
+        if owns_session:
+            session = aiohttp.ClientSession(headers=self._auth_headers)
+        
+        start_time = time.perf_counter()
+        try:
+            async with session.post(
+                f"{self.base_url}/chat/completions",
+                data=dumps(self._build_payload(prompt, **kwargs)),
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout)
+            ) as response:
+                response.raise_for_status()
+                data = loads(await response.read())
+            
+            return self._parse_completion(data, start_time)
             
         except Exception as e:
             self.logger.error(f"Failed to generate text with OpenAI: {e}")
@@ -150,29 +444,239 @@ class OpenAIProvider(BaseLLMProvider):
                 error=str(e),
                 provider="openai"
             )
+        finally:
+            if owns_session:
+                await session.close()
     
-    def estimate_cost(self, tokens_used: int, model: str = None) -> float:
-        """Estimate cost based on token usage"""
-        model = model or self.config.model
-        
-        # Token pricing per 1K tokens (as of 2024)
-        pricing = {
-            "gpt-4": {"input": 0.03, "output": 0.06},
-            "gpt-4-turbo": {"input": 0.01, "output": 0.03},
-            "gpt-4o": {"input": 0.005, "output": 0.015},
-            "gpt-4o-mini": {"input": 0.00015, "output": 0.0006},
-            "gpt-3.5-turbo": {"input": 0.0015, "output": 0.002},
-            "gpt-3.5-turbo-16k": {"input": 0.003, "output": 0.004}
-        }
+    async def agenerate_many(self, prompts: List[str], concurrency: int = 10, **kwargs) -> List[LLMResponse]:
+        """Generate responses for many prompts concurrently on one connection pool"""
+        semaphore = asyncio.Semaphore(concurrency)
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        
+        async with aiohttp.ClientSession(connector=connector, headers=self._auth_headers) as session:
+            async def run(prompt: str) -> LLMResponse:
+                async with semaphore:
+                    return await self.agenerate(prompt, session=session, **kwargs)
+            
+            return list(await asyncio.gather(*(run(prompt) for prompt in prompts)))
+    
+    def generate_many(self, prompts: List[str], concurrency: int = 10, **kwargs) -> List[LLMResponse]:
+        """Generate responses for many prompts concurrently.
+        
+        Blocking wrapper around agenerate_many; results keep the order of
+        ``prompts``. Falls back to a thread pool when aiohttp is not
+        installed. Must not be called from a running event loop.
+        """
+        if not prompts:
+            return []
+        
+        if aiohttp is None:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(prompts))) as executor:
+                return list(executor.map(lambda prompt: self.generate(prompt, **kwargs), prompts))
+        
+        return asyncio.run(self.agenerate_many(prompts, concurrency, **kwargs))
+    
+    def generate_multi(self, prompts: List[str], **kwargs) -> List[LLMResponse]:
+        """Answer several prompts with a single chat completion request.
         
-        if model not in pricing:
+        The prompts are numbered in one user message and the model replies
+        with a JSON object keyed by number, so N prompts cost one request
+        against the rate limit instead of N. Results keep the order of
+        ``prompts``; the request's token usage is split evenly across them.
+        """
+        if len(prompts) <= 1:
+            return [self.generate(prompt, **kwargs) for prompt in prompts]
+        
+        numbered = "\n".join(f"{index}) {prompt}" for index, prompt in enumerate(prompts, 1))
+        combined = (
+            "Answer each numbered request below separately. Return only a JSON object "
+            "mapping each request number to its answer as a string, like "
+            "{\"1\": \"...\", \"2\": \"...\"}.\n\n" + numbered
+        )
+        kwargs.setdefault("max_tokens", self.config.max_tokens * len(prompts))
+        response = self.generate(combined, json_mode=True, **kwargs)
+        if not response.success:
+            return [response] * len(prompts)
+        
+        try:
+            answers = loads(response.content)
+            if not isinstance(answers, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            error = f"Could not parse combined response: {e}"
+            return [LLMResponse(content="", success=False, error=error, provider="openai")] * len(prompts)
+        
+        tokens, remainder = divmod(response.tokens_used or 0, len(prompts))
+        results = []
+        for index in range(1, len(prompts) + 1):
+            answer = answers.get(str(index))
+            share = tokens + (remainder if index == 1 else 0)
+            if answer is None:
+                results.append(LLMResponse(
+                    content="",
+                    success=False,
+                    error=f"No answer for request {index} in combined response",
+                    model=response.model,
+                    tokens_used=share,
+                    provider="openai"
+                ))
+                continue
+            results.append(LLMResponse(
+                content=answer if isinstance(answer, str) else dumps(answer).decode("utf-8"),
+                success=True,
+                model=response.model,
+                tokens_used=share,
+                response_time=response.response_time,
+                provider="openai"
+            ))
+        return results
+    
+    def submit_batch(self, prompts: List[str], **kwargs) -> str:
+        """Submit prompts as an asynchronous Batch API job and return its id.
+        
+        Batch jobs are billed at half price and complete within 24 hours.
+        """
+        lines = [
+            dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._build_payload(prompt, **kwargs)
+            })
+            for index, prompt in enumerate(prompts)
+        ]
+        
+        # Drop the session's JSON content type so requests sets the multipart boundary
+        upload = self._batch_session.post(
+            f"{self.base_url}/files",
+            headers={"Content-Type": None},
+            data={"purpose": "batch"},
+            files={"file": ("batch.jsonl", b"\n".join(lines), "application/jsonl")},
+            timeout=self.config.timeout
+        )
+        raise_for_status(upload)
+        
+        response = self._batch_session.post(
+            f"{self.base_url}/batches",
+            json={
+                "input_file_id": upload.json()["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h"
+            },
+            timeout=self.config.timeout
+        )
+        raise_for_status(response)
+        return response.json()["id"]
+    
+    def poll_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Get the current state of a Batch API job"""
+        response = self._session.get(f"{self.base_url}/batches/{batch_id}", timeout=10)
+        raise_for_status(response)
+        return response.json()
+    
+    def wait_for_batch(self, batch_id: str, poll_interval: float = 30) -> List[LLMResponse]:
+        """Block until a batch finishes and return its results in submission order"""
+        while True:
+            batch = self.poll_batch(batch_id)
+            if batch.get("status") in self.BATCH_TERMINAL_STATUSES:
+                break
+            time.sleep(poll_interval)
+        
+        # Successful requests land in the output file, failed ones in the error file
+        file_ids = [batch.get(key) for key in ("output_file_id", "error_file_id") if batch.get(key)]
+        if batch.get("status") != "completed" or not file_ids:
+            raise RuntimeError(f"Batch {batch_id} ended with status '{batch.get('status')}'")
+        
+        results = {}
+        for file_id in file_ids:
+            self._read_batch_results(file_id, results)
+        
+        # Requests missing from both files still get a failed entry, so the
+        # list lines up with the submitted prompts
+        total = (batch.get("request_counts") or {}).get("total") or max(results, default=-1) + 1
+        return [
+            results.get(index) or LLMResponse(
+                content="",
+                success=False,
+                error="No result returned for this batch request",
+                provider="openai"
+            )
+            for index in range(total)
+        ]
+    
+    def _read_batch_results(self, file_id: str, results: Dict[int, LLMResponse]) -> None:
+        """Parse one batch result file into results, keyed by request index"""
+        response = self._session.get(f"{self.base_url}/files/{file_id}/content", timeout=self.config.timeout)
+        raise_for_status(response)
+        
+        for line in response.text.splitlines():
+            if not line.strip():
+                continue
+            record = loads(line)
+            body = (record.get("response") or {}).get("body") or {}
+            if record.get("error") or "choices" not in body:
+                error = record.get("error") or body.get("error") or "Batch request failed"
+                results[int(record["custom_id"])] = LLMResponse(
+                    content="",
+                    success=False,
+                    error=str(error),
+                    provider="openai"
+                )
+            else:
+                results[int(record["custom_id"])] = self._parse_completion(body)
+    
+    def estimate_tokens(self, text: str) -> int:
+        """Count the tokens in text locally, without calling the API.
+        
+        Uses tiktoken when installed; otherwise approximates from length.
+        """
+        if tiktoken is None:
+            return -(-len(text) // _CHARS_PER_TOKEN)
+        return len(_encoding_for(self.config.model).encode(text))
+    
+    def preflight_cost(self, prompt: str, expected_output_tokens: Optional[int] = None) -> float:
+        """Estimate what a generate() call will cost before sending it.
+        
+        Input covers the system and user messages; output defaults to the
+        configured max_tokens, so the estimate is an upper bound.
+        """
+        prices = _PRICING.get(self.config.model)
+        if prices is None:
             return 0.0
+        input_price, output_price = prices
+        
+        input_tokens = self.estimate_tokens(_SYSTEM_PROMPT) + self.estimate_tokens(prompt)
+        if expected_output_tokens is None:
+            expected_output_tokens = self.config.max_tokens
+        
+        return round((input_tokens * input_price + expected_output_tokens * output_price) / 1000.0, 6)
+    
+    def estimate_cost(self, tokens_used: int, model: str = None, batch: bool = False,
+                      cached_input_tokens: int = 0) -> float:
+        """Estimate cost based on token usage; Batch API jobs cost half.
+        
+        ``cached_input_tokens`` (from ``usage.prompt_tokens_details``) are
+        billed at CACHED_INPUT_DISCOUNT of the input price.
+        """
+        return float(self.estimate_costs([tokens_used], model, batch, [cached_input_tokens])[0])
+    
+    def estimate_costs(self, tokens_used, model: str = None, batch: bool = False,
+                       cached_input_tokens=0) -> np.ndarray:
+        """Vectorized estimate_cost over an array of per-request token counts"""
+        tokens = np.asarray(tokens_used, dtype=np.float64)
+        
+        prices = _PRICING.get(model or self.config.model)
+        if prices is None:
+            return np.zeros_like(tokens)
+        input_price, output_price = prices
         
         # Rough estimation (assuming 70% input, 30% output)
-        input_tokens = int(tokens_used * 0.7)
-        output_tokens = int(tokens_used * 0.3)
+        input_tokens = tokens * 0.7
+        cost = (input_tokens * input_price + tokens * 0.3 * output_price) / 1000.0
+        cached = np.minimum(np.asarray(cached_input_tokens, dtype=np.float64), input_tokens)
+        cost -= cached * input_price * (1.0 - self.CACHED_INPUT_DISCOUNT) / 1000.0
         
-        cost = (input_tokens / 1000 * pricing[model]["input"] + 
-                output_tokens / 1000 * pricing[model]["output"])
+        if batch:
+            cost *= self.BATCH_DISCOUNT
         
-        return round(cost, 6)
+        return np.round(cost, 6)
@@ -4,11 +4,11 @@ Main entry point for InsightPilot application
 
 import sys
 import os
-import argparse
+import atexit
 import logging
-from pathlib import Path
-from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QThread, Signal
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from types import SimpleNamespace
 
 # Add the src directory to Python path to enable absolute imports
 if getattr(sys, 'frozen', False):
@@ -20,95 +20,121 @@ else:
 
 sys.path.insert(0, application_path)
 
-from ui.main_window import MainWindow
-from api.server_api import run_server
-from config.config_manager import ConfigManager
+MODES = ("standalone", "client", "server")
+DEFAULT_MODE = "standalone"
+DEFAULT_HOST = "localhost"
+DEFAULT_PORT = 50051
 
+# Flags that take a value, as "--flag value" or "--flag=value"
+_VALUE_FLAGS = frozenset({"--mode", "--config", "--host", "--port"})
 
-class ServerThread(QThread):
-    """Thread for running gRPC server in background"""
-    server_started = Signal(str, int)
-    server_error = Signal(str)
-    
-    def __init__(self, host: str, port: int, config_manager: ConfigManager):
-        super().__init__()
-        self.host = host
-        self.port = port
-        self.config_manager = config_manager
-        self.logger = logging.getLogger(__name__)
-        self.server_instance = None
-        
-    def run(self):
-        """Run the gRPC server in background thread"""
-        try:
-            self.logger.info(f"Starting gRPC server thread on {self.host}:{self.port}")
-            self.server_started.emit(self.host, self.port)
-            
-            # Import here to avoid circular imports
-            from api.server_api import InsightPilotServer
-            
-            # Create and start server
-            self.server_instance = InsightPilotServer(self.host, self.port, self.config_manager)
-            self.server_instance.start()
-            
-        except Exception as e:
-            self.logger.error(f"Server thread error: {e}")
-            self.server_error.emit(str(e))
-            
-    def stop_server(self):
-        """Gracefully stop the server"""
-        if self.server_instance:
-            self.server_instance.stop()
+USAGE = "usage: main.py [-h] [--mode {standalone,client,server}] [--config CONFIG] [--host HOST] [--port PORT] [--debug]"
 
+HELP = f"""{USAGE}
 
-def setup_logging():
-    """Configure logging for the application"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('insightpilot.log'),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+InsightPilot - AI-powered data exploration
+
+options:
+  -h, --help            show this help message and exit
+  --mode {{standalone,client,server}}
+                        Application mode (default: {DEFAULT_MODE})
+  --config CONFIG       Path to configuration file
+  --host HOST           Host for server mode (default: {DEFAULT_HOST})
+  --port PORT           Port for server mode (default: {DEFAULT_PORT})
+  --debug               Enable debug logging"""
 
+# Qt, gRPC and the UI are imported inside the mode that needs them so that
+# --help and headless server mode do not pay for loading PySide6.
 
-def parse_arguments():
+
+def setup_logging():
+    """Configure logging for the application
+    
+    Records are queued and written to the file and console by a background
+    listener, so logging from the GUI or request threads never blocks on I/O.
+    """
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.FileHandler('insightpilot.log'),
+        logging.StreamHandler(sys.stdout)
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    # The listener's handlers apply the real format; keep the queued message bare
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+
+
+def parse_arguments(argv=None):
     """Parse command line arguments"""
-    parser = argparse.ArgumentParser(description="InsightPilot - AI-powered data exploration")
-    parser.add_argument(
-        "--mode",
-        choices=["standalone", "client", "server"],
-        default="standalone",
-        help="Application mode (default: standalone)"
-    )
-    parser.add_argument(
-        "--config",
-        type=str,
-        help="Path to configuration file"
-    )
-    parser.add_argument(
-        "--host",
-        type=str,
-        default="localhost",
-        help="Host for server mode (default: localhost)"
+    args = SimpleNamespace(
+        mode=DEFAULT_MODE,
+        config=None,
+        host=DEFAULT_HOST,
+        port=DEFAULT_PORT,
+        debug=False
     )
-    parser.add_argument(
-        "--port",
-        type=int,
-        default=50051,
-        help="Port for server mode (default: 50051)"
-    )
-    parser.add_argument(
-        "--debug",
-        action="store_true",
-        help="Enable debug logging"
-    )
-    return parser.parse_args()
+    
+    def fail(message):
+        print(USAGE, file=sys.stderr)
+        print(f"main.py: error: {message}", file=sys.stderr)
+        sys.exit(2)
+    
+    remaining = list(sys.argv[1:] if argv is None else argv)
+    while remaining:
+        token = remaining.pop(0)
+        inline = "=" in token
+        flag, _, value = token.partition("=")
+        
+        if flag in ("-h", "--help") and not inline:
+            print(HELP)
+            sys.exit(0)
+        if flag == "--debug":
+            if inline:
+                fail(f"argument --debug: ignored explicit argument '{value}'")
+            args.debug = True
+            continue
+        if flag not in _VALUE_FLAGS:
+            fail(f"unrecognized arguments: {token}")
+        
+        # As with argparse, "--flag=" gives an empty value while a following
+        # option is never taken as the value
+        if not inline:
+            if not remaining or remaining[0].startswith("--") or remaining[0] == "-h":
+                fail(f"argument {flag}: expected one argument")
+            value = remaining.pop(0)
+        
+        if flag == "--mode":
+            if value not in MODES:
+                fail(f"argument --mode: invalid choice: '{value}' (choose from {', '.join(MODES)})")
+            args.mode = value
+        elif flag == "--port":
+            try:
+                args.port = int(value)
+            except ValueError:
+                fail(f"argument --port: invalid int value: '{value}'")
+        else:
+            setattr(args, flag[2:], value)
+    
+    return args
 
 
 def run_standalone_mode():
     """Run InsightPilot in standalone mode (GUI + local LLM + gRPC server)"""
+    import asyncio
+    import qasync
+    from PySide6.QtWidgets import QApplication
+    from ui.main_window import MainWindow
+    from api.server_api import InsightPilotServer
+    from config.config_manager import ConfigManager
+    
     app = QApplication(sys.argv)
     app.setApplicationName("InsightPilot")
     app.setApplicationVersion("1.0.0")
@@ -120,10 +146,14 @@ def run_standalone_mode():
     window = MainWindow(config_manager)
     window.show()
     
-    # Start gRPC server in background thread
-    server_thread = ServerThread("localhost", 50051, config_manager)
+    # Run the Qt event loop through asyncio so the gRPC server can share it
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    app_close_event = asyncio.Event()
+    app.aboutToQuit.connect(app_close_event.set)
+    
+    server_instance = InsightPilotServer("localhost", 50051, config_manager)
     
-    # Connect server signals to handle server events
     def on_server_started(host, port):
         window.status_bar.showMessage(f"Ready - Standalone Mode (Server: {host}:{port})")
         if hasattr(window, 'server_status_label'):
@@ -138,20 +168,27 @@ def run_standalone_mode():
             window.server_status_label.setStyleSheet("color: red; font-weight: bold;")
         logging.getLogger(__name__).error(f"gRPC server error: {error}")
     
-    server_thread.server_started.connect(on_server_started)
-    server_thread.server_error.connect(on_server_error)
-    
-    # Start the server thread
-    server_thread.start()
+    async def start_server():
+        try:
+            await server_instance.start_async()
+            on_server_started(server_instance.host, server_instance.port)
+        except Exception as e:
+            on_server_error(str(e))
     
-    # Store server thread reference to prevent garbage collection
-    window.server_thread = server_thread
+    with loop:
+        loop.create_task(start_server())
+        loop.run_until_complete(app_close_event.wait())
+        loop.run_until_complete(server_instance.stop_async())
     
-    return app.exec()
+    return 0
 
 
 def run_client_mode():
     """Run InsightPilot in client mode (GUI only, connects to remote server)"""
+    from PySide6.QtWidgets import QApplication
+    from ui.main_window import MainWindow
+    from config.config_manager import ConfigManager
+    
     app = QApplication(sys.argv)
     app.setApplicationName("InsightPilot Client")
     app.setApplicationVersion("1.0.0")
@@ -168,6 +205,9 @@ def run_client_mode():
 
 def run_server_mode(host: str, port: int):
     """Run InsightPilot in server mode (headless, gRPC server)"""
+    from api.server_api import run_server
+    from config.config_manager import ConfigManager
+    
     logging.info(f"Starting InsightPilot server on {host}:{port}")
     
     # Initialize configuration
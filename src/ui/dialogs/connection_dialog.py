@@ -2,141 +2,462 @@
 Connection Dialog - Database connection configuration
 """
 
+import hashlib
+import importlib
+import json
 import logging
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from urllib.parse import quote_plus
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
     QLabel, QLineEdit, QComboBox, QPushButton, QSpinBox,
     QGroupBox, QMessageBox, QCheckBox, QTabWidget, QWidget
 )
-from PySide6.QtCore import Qt, QThread, Signal
-from PySide6.QtGui import QFont
+from PySide6.QtCore import Qt, QCoreApplication, QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QColor, QFont, QPalette
 
 
-class ConnectionTestThread(QThread):
-    """Thread for testing database connections"""
+# UI display names to connection sub-types, and back
+_SUB_TYPE_MAP = {"MySQL": "mysql", "MongoDB": "mongodb", "PostgreSQL": "postgres"}
+_DISPLAY_MAP = {sub_type: display for display, sub_type in _SUB_TYPE_MAP.items()}
+
+# Advanced tab defaults, used until that tab has been opened
+_DEFAULT_TIMEOUT_S = 30
+_DEFAULT_AUTOCOMMIT = True
+
+# Driver modules used by the connection testers
+_DRIVER_MODULES = ('mysql.connector.pooling', 'oracledb', 'pymongo', 'psycopg2.pool')
+
+# Database driver modules, resolved once per process (None if not installed)
+_DRIVERS = {}
+
+
+def _load_driver(module_name):
+    """Return a cached database driver module, or None if it is not installed"""
+    try:
+        return _DRIVERS[module_name]
+    except KeyError:
+        pass
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError:
+        module = None
+    _DRIVERS[module_name] = module
+    return module
+
+
+def _set_hint_style(label, pixel_size=None):
+    """Render a label as grey italic hint text without a style sheet"""
+    palette = label.palette()
+    palette.setColor(QPalette.WindowText, QColor("#666666"))
+    label.setPalette(palette)
+    
+    font = label.font()
+    font.setItalic(True)
+    if pixel_size is not None:
+        font.setPixelSize(pixel_size)
+    label.setFont(font)
+
+
+# Background thread importing the drivers, started at most once
+_prewarm_thread = None
+
+
+def prewarm_drivers():
+    """Import the database drivers ahead of the first connection test.
+    
+    Safe to call repeatedly; only the first call starts the import thread.
+    """
+    global _prewarm_thread
+    if _prewarm_thread is not None or all(name in _DRIVERS for name in _DRIVER_MODULES):
+        return
+    _prewarm_thread = threading.Thread(
+        target=lambda: [_load_driver(name) for name in _DRIVER_MODULES],
+        name="driver-prewarm",
+        daemon=True
+    )
+    _prewarm_thread.start()
+
+
+class ConnectionTestSignals(QObject):
+    """Signals emitted by a ConnectionTestTask"""
     result_ready = Signal(bool, str)
+
+
+class ConnectionTestTask(QRunnable):
+    """Task for testing database connections on Qt's global thread pool"""
+    
+    # Tester method for each database sub-type
+    _TESTERS = {
+        'mysql': 'test_mysql_connection',
+        'oracle': 'test_oracle_connection',
+        'mongodb': 'test_mongodb_connection',
+        'postgres': 'test_postgres_connection'
+    }
+    
+    # Seconds to wait for each of the DNS lookup and TCP reachability probe
+    PROBE_TIMEOUT_S = 2
+    
+    # Driver connect timeout for tests; the stored connection timeout is
+    # meant for real sessions, while a test should answer quickly
+    TEST_TIMEOUT_S = 3
+    
+    # Seconds a successful test result is reused for an unchanged config
+    VALIDATION_TTL_S = 300
+    
+    # Config digest -> (success, message, monotonic timestamp)
+    _validation_cache = {}
+    
+    # Warm pools are closed once idle this long, or once more than
+    # MAX_POOLS targets have pools open (least recently used first)
+    POOL_IDLE_TTL_S = 300
+    MAX_POOLS = 4
+    
+    # Warm connection pools shared by repeated tests of the same target,
+    # as pool key -> (pool, monotonic time of last use)
+    _pool_cache = OrderedDict()
+    _pool_lock = threading.Lock()
+    
+    # Worker threads for tests, created on first use
+    _thread_pool = None
+    
+    # getaddrinfo() has no timeout of its own, so lookups run here and are
+    # waited on for at most PROBE_TIMEOUT_S
+    _resolver = ThreadPoolExecutor(max_workers=2, thread_name_prefix="dns-probe")
     
     def __init__(self, connection_config):
         super().__init__()
         self.connection_config = connection_config
-        
+        self.signals = ConnectionTestSignals()
+        self._uri = None
+    
+    @classmethod
+    def thread_pool(cls):
+        """Return the pool tests run on; its threads stay alive between tests"""
+        if cls._thread_pool is None:
+            pool = QThreadPool()
+            pool.setMaxThreadCount(2)
+            # Never retire idle threads, so a re-test doesn't spawn a new one
+            pool.setExpiryTimeout(-1)
+            cls._thread_pool = pool
+            
+            # Don't leave database sessions open past the application
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(cls.close_all_pools)
+        return cls._thread_pool
+    
+    @staticmethod
+    def _validation_key(config):
+        """Digest a connection config without keeping the plain password"""
+        public = {key: value for key, value in config.items() if key != 'password'}
+        public['password'] = hashlib.sha256(config.get('password', '').encode()).hexdigest()
+        return hashlib.blake2b(json.dumps(public, sort_keys=True).encode()).hexdigest()
+    
+    @classmethod
+    def cached_result(cls, config):
+        """Return a recent successful (success, message) for this config, or None"""
+        entry = cls._validation_cache.get(cls._validation_key(config))
+        if entry and time.monotonic() - entry[2] < cls.VALIDATION_TTL_S:
+            return entry[0], entry[1]
+        return None
+    
+    def _emit_result(self, success, message):
+        """Remember successful results, forget failed targets, then emit"""
+        key = self._validation_key(self.connection_config)
+        if success:
+            self._validation_cache[key] = (success, message, time.monotonic())
+        else:
+            self._validation_cache.pop(key, None)
+        self.signals.result_ready.emit(success, message)
+    
+    def _pool_key(self):
+        """Identify the target and credentials a pool was opened with"""
+        cfg = self.connection_config
+        password_digest = hashlib.sha256(cfg.get('password', '').encode()).hexdigest()
+        return (cfg.get('sub_type'), cfg['host'], cfg['port'], cfg['username'],
+                cfg.get('database', ''), cfg.get('service_name', ''), password_digest)
+    
+    @staticmethod
+    def _close_pool(pool):
+        """Close a pool's connections where the driver supports it"""
+        # psycopg2 pools use closeall(), oracledb and pymongo close(); MySQL's
+        # pool only exposes _remove_connections()
+        close = (getattr(pool, 'closeall', None) or getattr(pool, 'close', None)
+                 or getattr(pool, '_remove_connections', None))
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+    
+    @classmethod
+    def _evict_pools(cls, now):
+        """Remove idle and surplus pools from the cache and return them.
+        
+        Must be called with _pool_lock held; close the returned pools
+        after releasing it.
+        """
+        evicted = []
+        for key, (pool, last_used) in list(cls._pool_cache.items()):
+            if now - last_used >= cls.POOL_IDLE_TTL_S:
+                del cls._pool_cache[key]
+                evicted.append(pool)
+        while len(cls._pool_cache) > cls.MAX_POOLS:
+            evicted.append(cls._pool_cache.popitem(last=False)[1][0])
+        return evicted
+    
+    @classmethod
+    def _discard_pool(cls, key):
+        """Drop a cached pool and close its connections"""
+        with cls._pool_lock:
+            entry = cls._pool_cache.pop(key, None)
+        if entry is not None:
+            cls._close_pool(entry[0])
+    
+    @classmethod
+    def close_all_pools(cls):
+        """Close every cached pool, e.g. when the application quits"""
+        with cls._pool_lock:
+            pools = [pool for pool, _ in cls._pool_cache.values()]
+            cls._pool_cache.clear()
+        for pool in pools:
+            cls._close_pool(pool)
+    
+    def _cached_pool(self, key, created=None):
+        """Return the cached pool for key, caching created if there is none.
+        
+        Marks the pool as just used and closes any pools evicted meanwhile.
+        """
+        with self._pool_lock:
+            now = time.monotonic()
+            entry = self._pool_cache.get(key)
+            pool = entry[0] if entry is not None else created
+            if pool is not None:
+                self._pool_cache[key] = (pool, now)
+                self._pool_cache.move_to_end(key)
+            evicted = self._evict_pools(now)
+        for stale in evicted:
+            self._close_pool(stale)
+        return pool
+    
+    def _check_pooled(self, create_pool, check):
+        """Run check(pool) against the cached pool for this target.
+        
+        A failure on a reused pool may only mean its connections went stale,
+        so the pool is discarded and the check retried once on a fresh one.
+        """
+        key = self._pool_key()
+        while True:
+            pool = self._cached_pool(key)
+            reused = pool is not None
+            if not reused:
+                # Connect outside the lock so tests of other targets aren't held up
+                created = create_pool()
+                pool = self._cached_pool(key, created)
+                if pool is not created:
+                    self._close_pool(created)
+            try:
+                check(pool)
+                return
+            except Exception:
+                self._discard_pool(key)
+                if not reused:
+                    raise
+    
+    def _probe(self, host, port):
+        """Resolve and connect to host:port, raising OSError on failure"""
+        lookup = self._resolver.submit(socket.getaddrinfo, host, port, type=socket.SOCK_STREAM)
+        try:
+            address = lookup.result(timeout=self.PROBE_TIMEOUT_S)[0][4]
+        except FuturesTimeoutError:
+            raise OSError(f"no DNS answer within {self.PROBE_TIMEOUT_S}s")
+        socket.create_connection(address[:2], timeout=self.PROBE_TIMEOUT_S).close()
+    
     def run(self):
         """Test the database connection"""
         try:
+            # Fail fast on a wrong host or port before any driver handshake
+            host, port = self.connection_config['host'], self.connection_config['port']
+            try:
+                self._probe(host, port)
+            except OSError as e:
+                self._emit_result(False, f"Host unreachable: {host}:{port} ({e})")
+                return
+            
             # Use sub_type instead of type for provider selection
             db_sub_type = self.connection_config.get('sub_type', 'mysql')
             
-            if db_sub_type == 'mysql':
-                success, message = self.test_mysql_connection()
-            elif db_sub_type == 'oracle':
-                success, message = self.test_oracle_connection()
-            elif db_sub_type == 'mongodb':
-                success, message = self.test_mongodb_connection()
-            elif db_sub_type == 'postgres':
-                success, message = self.test_postgres_connection()
+            tester = self._TESTERS.get(db_sub_type)
+            if tester is not None:
+                success, message = getattr(self, tester)()
             else:
                 success, message = False, f"Unsupported database sub-type: {db_sub_type}"
                 
-            self.result_ready.emit(success, message)
+            self._emit_result(success, message)
             
         except Exception as e:
-            self.result_ready.emit(False, f"Connection test error: {str(e)}")
+            self._emit_result(False, f"Connection test error: {str(e)}")
     
     def test_mysql_connection(self):
         """Test MySQL connection"""
+        mysql_pooling = _load_driver('mysql.connector.pooling')
+        if mysql_pooling is None:
+            return False, "MySQL connector not installed. Please install mysql-connector-python."
+        
         try:
-            import mysql.connector
-            
             config = {
                 'host': self.connection_config['host'],
                 'port': self.connection_config['port'],
                 'user': self.connection_config['username'],
                 'password': self.connection_config['password'],
                 'database': self.connection_config.get('database', ''),
-                'connection_timeout': 10
+                'connection_timeout': self.TEST_TIMEOUT_S
             }
             
             # Remove empty database name
             if not config['database']:
                 del config['database']
             
-            connection = mysql.connector.connect(**config)
-            connection.close()
+            def check(pool):
+                connection = pool.get_connection()
+                try:
+                    connection.ping(reconnect=False)
+                finally:
+                    # Returns the connection to the pool
+                    connection.close()
+            
+            def create_pool():
+                # Prefer the C extension for a faster handshake when it is built
+                try:
+                    return mysql_pooling.MySQLConnectionPool(
+                        pool_name="insightpilot_test", pool_size=1, use_pure=False, **config
+                    )
+                except ImportError:
+                    return mysql_pooling.MySQLConnectionPool(
+                        pool_name="insightpilot_test", pool_size=1, **config
+                    )
+            
+            self._check_pooled(create_pool, check)
             
             return True, "MySQL connection successful!"
             
-        except ImportError:
-            return False, "MySQL connector not installed. Please install mysql-connector-python."
         except Exception as e:
             return False, f"MySQL connection failed: {str(e)}"
     
     def test_oracle_connection(self):
         """Test Oracle connection"""
+        oracledb = _load_driver('oracledb')
+        if oracledb is None:
+            return False, "Oracle client not installed. Please install oracledb."
+        
+        # Built exactly as the adapter builds it for the saved connection
+        from adapters.oracle_adapter import oracle_dsn
+        
         try:
-            import oracledb
+            cfg = self.connection_config
+            dsn = oracle_dsn(cfg['host'], cfg['port'], cfg.get('service_name') or cfg.get('sid'))
             
-            # Build connection string
-            if self.connection_config.get('service_name'):
-                dsn = f"{self.connection_config['host']}:{self.connection_config['port']}/{self.connection_config['service_name']}"
-            else:
-                dsn = f"{self.connection_config['host']}:{self.connection_config['port']}/{self.connection_config.get('sid', 'XE')}"
+            def check(pool):
+                # Released back to the pool when the block exits
+                with pool.acquire() as connection:
+                    # A bare round trip; bound it so a hung server can't stall the test
+                    connection.call_timeout = self.TEST_TIMEOUT_S * 1000
+                    connection.ping()
             
-            connection = oracledb.connect(
-                user=self.connection_config['username'],
-                password=self.connection_config['password'],
-                dsn=dsn
+            self._check_pooled(
+                lambda: oracledb.create_pool(
+                    user=self.connection_config['username'],
+                    password=self.connection_config['password'],
+                    dsn=dsn,
+                    min=1,
+                    max=2,
+                    increment=1,
+                    # check() pings explicitly; skip the pool's own ping on acquire
+                    ping_interval=0,
+                    tcp_connect_timeout=self.TEST_TIMEOUT_S
+                ),
+                check
             )
-            connection.close()
             
             return True, "Oracle connection successful!"
             
-        except ImportError:
-            return False, "Oracle client not installed. Please install oracledb."
         except Exception as e:
             return False, f"Oracle connection failed: {str(e)}"
     
+    def _mongo_uri(self):
+        """Build the MongoDB URI once, escaping credentials that contain @ or :"""
+        if self._uri is None:
+            cfg = self.connection_config
+            if cfg.get('username') and cfg.get('password'):
+                user = quote_plus(cfg['username'])
+                password = quote_plus(cfg['password'])
+                self._uri = f"mongodb://{user}:{password}@{cfg['host']}:{cfg['port']}/{cfg.get('database', 'admin')}"
+            else:
+                self._uri = f"mongodb://{cfg['host']}:{cfg['port']}"
+        return self._uri
+    
     def test_mongodb_connection(self):
         """Test MongoDB connection"""
+        pymongo = _load_driver('pymongo')
+        if pymongo is None:
+            return False, "MongoDB driver not installed. Please install pymongo."
+        
         try:
-            import pymongo
+            uri = self._mongo_uri()
             
-            # Build connection URI
-            if self.connection_config.get('username') and self.connection_config.get('password'):
-                uri = f"mongodb://{self.connection_config['username']}:{self.connection_config['password']}@{self.connection_config['host']}:{self.connection_config['port']}/{self.connection_config.get('database', 'admin')}"
-            else:
-                uri = f"mongodb://{self.connection_config['host']}:{self.connection_config['port']}"
-            
-            client = pymongo.MongoClient(uri, serverSelectionTimeoutMS=10000)
-            # Test connection
-            client.admin.command('ping')
-            client.close()
+            # MongoClient pools connections itself; reuse it across tests
+            self._check_pooled(
+                lambda: pymongo.MongoClient(
+                    uri,
+                    serverSelectionTimeoutMS=self.TEST_TIMEOUT_S * 1000,
+                    connectTimeoutMS=self.TEST_TIMEOUT_S * 1000,
+                    # Talk to the given node only; skip replica-set discovery
+                    directConnection=True
+                ),
+                lambda client: client.admin.command('ping')
+            )
             
             return True, "MongoDB connection successful!"
             
-        except ImportError:
-            return False, "MongoDB driver not installed. Please install pymongo."
         except Exception as e:
             return False, f"MongoDB connection failed: {str(e)}"
     
     def test_postgres_connection(self):
         """Test PostgreSQL connection"""
+        psycopg2_pool = _load_driver('psycopg2.pool')
+        if psycopg2_pool is None:
+            return False, "PostgreSQL driver not installed. Please install psycopg2."
+        
         try:
-            import psycopg2
+            def check(pool):
+                connection = pool.getconn()
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute("SELECT 1")
+                    connection.rollback()
+                finally:
+                    pool.putconn(connection)
             
-            connection = psycopg2.connect(
-                host=self.connection_config['host'],
-                port=self.connection_config['port'],
-                user=self.connection_config['username'],
-                password=self.connection_config['password'],
-                database=self.connection_config.get('database', 'postgres'),
-                connect_timeout=10
+            self._check_pooled(
+                lambda: psycopg2_pool.ThreadedConnectionPool(
+                    1, 4,
+                    host=self.connection_config['host'],
+                    port=self.connection_config['port'],
+                    user=self.connection_config['username'],
+                    password=self.connection_config['password'],
+                    database=self.connection_config.get('database', 'postgres'),
+                    connect_timeout=self.TEST_TIMEOUT_S
+                ),
+                check
             )
-            connection.close()
             
             return True, "PostgreSQL connection successful!"
             
-        except ImportError:
-            return False, "PostgreSQL driver not installed. Please install psycopg2."
         except Exception as e:
             return False, f"PostgreSQL connection failed: {str(e)}"
 
@@ -154,10 +475,19 @@ class ConnectionDialog(QDialog):
         self.setModal(True)
         self.resize(500, 600)
         
-        self.test_thread = None
+        self.test_task = None
+        
+        # Database type -> its settings group, built on first selection
+        self._db_groups = {}
+        
+        # Stripped name, host and user, refreshed by validate_inputs()
+        self._name = self._host = self._user = ""
         
         self.setup_ui()
         
+        # Overlap driver import time with the user filling in the form
+        prewarm_drivers()
+        
         if connection_name:
             self.load_connection_config()
     
@@ -175,7 +505,9 @@ class ConnectionDialog(QDialog):
         if self.connection_name:
             self.name_edit.setReadOnly(True)
             self.name_edit.setToolTip("Connection name cannot be changed when editing an existing connection")
-            self.name_edit.setStyleSheet("background-color: #f0f0f0;")
+            palette = self.name_edit.palette()
+            palette.setColor(QPalette.Base, QColor("#f0f0f0"))
+            self.name_edit.setPalette(palette)
         
         name_layout.addWidget(self.name_edit)
         layout.addLayout(name_layout)
@@ -197,7 +529,7 @@ class ConnectionDialog(QDialog):
         # Add info label for edit mode
         if self.connection_name:
             info_label = QLabel("(Type cannot be changed)")
-            info_label.setStyleSheet("color: #666666; font-style: italic; font-size: 10px;")
+            _set_hint_style(info_label, pixel_size=10)
             type_layout.addWidget(info_label)
         else:
             type_layout.addWidget(QLabel("Type of database to connect to"))
@@ -211,11 +543,14 @@ class ConnectionDialog(QDialog):
         # Parameters tab
         self.setup_parameters_tab()
         
-        # SSL tab (placeholder)
-        self.setup_ssl_tab()
-        
-        # Advanced tab
-        self.setup_advanced_tab()
+        # SSL and Advanced tabs are built the first time they are shown
+        self.timeout_spin = None
+        self.autocommit_check = None
+        self._lazy_tabs = {
+            self.tab_widget.addTab(QWidget(), "SSL"): self.setup_ssl_tab,
+            self.tab_widget.addTab(QWidget(), "Advanced"): self.setup_advanced_tab
+        }
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
         
         # Buttons
         button_layout = QHBoxLayout()
@@ -285,11 +620,14 @@ class ConnectionDialog(QDialog):
         
         layout.addStretch()
     
-    def setup_ssl_tab(self):
+    def _on_tab_changed(self, index):
+        """Build a lazily created tab on its first view"""
+        setup = self._lazy_tabs.pop(index, None)
+        if setup is not None:
+            setup(self.tab_widget.widget(index))
+    
+    def setup_ssl_tab(self, ssl_widget):
         """Set up the SSL tab"""
-        ssl_widget = QWidget()
-        self.tab_widget.addTab(ssl_widget, "SSL")
-        
         layout = QVBoxLayout(ssl_widget)
         
         ssl_label = QLabel("SSL Configuration")
@@ -298,16 +636,13 @@ class ConnectionDialog(QDialog):
         
         placeholder_label = QLabel("SSL configuration options will be implemented in the full version.")
         placeholder_label.setAlignment(Qt.AlignCenter)
-        placeholder_label.setStyleSheet("color: #666666; font-style: italic;")
+        _set_hint_style(placeholder_label)
         layout.addWidget(placeholder_label)
         
         layout.addStretch()
     
-    def setup_advanced_tab(self):
+    def setup_advanced_tab(self, advanced_widget):
         """Set up the advanced tab"""
-        advanced_widget = QWidget()
-        self.tab_widget.addTab(advanced_widget, "Advanced")
-        
         layout = QVBoxLayout(advanced_widget)
         
         advanced_label = QLabel("Advanced Options")
@@ -319,13 +654,13 @@ class ConnectionDialog(QDialog):
         # Connection timeout
         self.timeout_spin = QSpinBox()
         self.timeout_spin.setRange(1, 300)
-        self.timeout_spin.setValue(30)
+        self.timeout_spin.setValue(_DEFAULT_TIMEOUT_S)
         self.timeout_spin.setSuffix(" seconds")
         form_layout.addRow("Connection Timeout:", self.timeout_spin)
         
         # Auto-commit
         self.autocommit_check = QCheckBox("Enable auto-commit")
-        self.autocommit_check.setChecked(True)
+        self.autocommit_check.setChecked(_DEFAULT_AUTOCOMMIT)
         form_layout.addRow("", self.autocommit_check)
         
         layout.addLayout(form_layout)
@@ -333,50 +668,36 @@ class ConnectionDialog(QDialog):
     
     def on_type_changed(self, db_type):
         """Handle database type change"""
-        # Clear existing database-specific fields
-        self.clear_db_specific_fields()
+        self.show_db_specific_fields(db_type)
         
         if db_type == "MySQL":
-            self.setup_mysql_fields()
             self.port_spin.setValue(3306)
         elif db_type == "Oracle":
-            self.setup_oracle_fields()
             self.port_spin.setValue(1521)
         elif db_type == "MongoDB":
-            self.setup_mongodb_fields()
             self.port_spin.setValue(27017)
         elif db_type == "PostgreSQL":
-            self.setup_postgresql_fields()
             self.port_spin.setValue(5432)
     
-    def clear_db_specific_fields(self):
-        """Clear database-specific fields"""
-        # Clear widget references first
-        if hasattr(self, 'mysql_schema_edit'):
-            delattr(self, 'mysql_schema_edit')
-        if hasattr(self, 'oracle_service_edit'):
-            delattr(self, 'oracle_service_edit')
-        if hasattr(self, 'oracle_conn_type'):
-            delattr(self, 'oracle_conn_type')
-        if hasattr(self, 'mongo_database_edit'):
-            delattr(self, 'mongo_database_edit')
-        if hasattr(self, 'mongo_auth_db_edit'):
-            delattr(self, 'mongo_auth_db_edit')
-        if hasattr(self, 'postgres_database_edit'):
-            delattr(self, 'postgres_database_edit')
-        if hasattr(self, 'postgres_schema_edit'):
-            delattr(self, 'postgres_schema_edit')
-        
-        # Remove and delete widgets from layout
-        while self.db_specific_layout.count() > 0:
-            child = self.db_specific_layout.takeAt(0)
-            if child and child.widget():
-                widget = child.widget()
-                widget.setParent(None)
-                widget.deleteLater()
+    def show_db_specific_fields(self, db_type):
+        """Show the settings group for db_type and hide the others"""
+        if db_type not in self._db_groups:
+            setup = {
+                "MySQL": self.setup_mysql_fields,
+                "Oracle": self.setup_oracle_fields,
+                "MongoDB": self.setup_mongodb_fields,
+                "PostgreSQL": self.setup_postgresql_fields
+            }.get(db_type)
+            if setup is not None:
+                group = setup()
+                self.db_specific_layout.addWidget(group)
+                self._db_groups[db_type] = group
+        
+        for group_type, group in self._db_groups.items():
+            group.setVisible(group_type == db_type)
     
     def setup_mysql_fields(self):
-        """Set up MySQL-specific fields"""
+        """Build the MySQL settings group"""
         mysql_group = QGroupBox("MySQL Settings")
         mysql_layout = QFormLayout(mysql_group)
         
@@ -385,10 +706,10 @@ class ConnectionDialog(QDialog):
         self.mysql_schema_edit.setPlaceholderText("The schema to use as default schema. Leave blank to select it later.")
         mysql_layout.addRow("Default Schema:", self.mysql_schema_edit)
         
-        self.db_specific_layout.addWidget(mysql_group)
+        return mysql_group
     
     def setup_oracle_fields(self):
-        """Set up Oracle-specific fields"""
+        """Build the Oracle settings group"""
         oracle_group = QGroupBox("Oracle Settings")
         oracle_layout = QFormLayout(oracle_group)
         
@@ -403,7 +724,7 @@ class ConnectionDialog(QDialog):
         self.oracle_service_edit.setPlaceholderText("e.g., orcl.db.oracle.com")
         oracle_layout.addRow("Service name:", self.oracle_service_edit)
         
-        self.db_specific_layout.addWidget(oracle_group)
+        return oracle_group
     
     def on_oracle_conn_type_changed(self, conn_type):
         """Handle Oracle connection type change"""
@@ -411,7 +732,7 @@ class ConnectionDialog(QDialog):
         pass
     
     def setup_mongodb_fields(self):
-        """Set up MongoDB-specific fields"""
+        """Build the MongoDB settings group"""
         mongo_group = QGroupBox("MongoDB Settings")
         mongo_layout = QFormLayout(mongo_group)
         
@@ -425,10 +746,10 @@ class ConnectionDialog(QDialog):
         self.mongo_auth_db_edit.setPlaceholderText("Database for authentication. Usually 'admin'.")
         mongo_layout.addRow("Auth Database:", self.mongo_auth_db_edit)
         
-        self.db_specific_layout.addWidget(mongo_group)
+        return mongo_group
     
     def setup_postgresql_fields(self):
-        """Set up PostgreSQL-specific fields"""
+        """Build the PostgreSQL settings group"""
         postgres_group = QGroupBox("PostgreSQL Settings")
         postgres_layout = QFormLayout(postgres_group)
         
@@ -442,60 +763,80 @@ class ConnectionDialog(QDialog):
         self.postgres_schema_edit.setPlaceholderText("Default schema. Usually 'public'.")
         postgres_layout.addRow("Schema:", self.postgres_schema_edit)
         
-        self.db_specific_layout.addWidget(postgres_group)
+        return postgres_group
     
     def get_connection_config(self):
         """Get the current connection configuration with new type/sub-type structure"""
         db_type = self.type_combo.currentText()
         
-        # Map UI display names to sub-types
-        sub_type_map = {
-            "MySQL": "mysql",
-            "MongoDB": "mongodb", 
-            "PostgreSQL": "postgres"
-        }
+        # The current type's settings group is always built, so its fields
+        # can be read directly
+        if db_type == 'MySQL':
+            specific = {'database': self.mysql_schema_edit.text()}
+        elif db_type == 'Oracle':
+            specific = {'service_name': self.oracle_service_edit.text()}
+        elif db_type == 'MongoDB':
+            specific = {
+                'database': self.mongo_database_edit.text(),
+                'auth_database': self.mongo_auth_db_edit.text() or 'admin'
+            }
+        elif db_type == 'PostgreSQL':
+            specific = {
+                'database': self.postgres_database_edit.text() or 'postgres',
+                'schema': self.postgres_schema_edit.text() or 'public'
+            }
+        else:
+            specific = {}
         
-        config = {
+        return {
             'type': 'DB',  # New connection type
-            'sub_type': sub_type_map.get(db_type, 'mysql'),  # New sub-type
+            'sub_type': _SUB_TYPE_MAP.get(db_type, 'mysql'),  # New sub-type
             'host': self.hostname_edit.text(),
             'port': self.port_spin.value(),
             'username': self.username_edit.text(),
             'password': self.password_edit.text(),
-            'timeout': self.timeout_spin.value(),
-            'autocommit': self.autocommit_check.isChecked(),
-            'enabled': True  # Default to enabled
+            'timeout': self.timeout_spin.value() if self.timeout_spin else _DEFAULT_TIMEOUT_S,
+            'autocommit': self.autocommit_check.isChecked() if self.autocommit_check else _DEFAULT_AUTOCOMMIT,
+            'enabled': True,  # Default to enabled
+            **specific
         }
-        
-        # Only access database-specific fields for the current database type
-        if db_type == 'MySQL':
-            config['database'] = getattr(self, 'mysql_schema_edit', QLineEdit()).text()
-        elif db_type == 'Oracle':
-            config['service_name'] = getattr(self, 'oracle_service_edit', QLineEdit()).text()
-        elif db_type == 'MongoDB':
-            config['database'] = getattr(self, 'mongo_database_edit', QLineEdit()).text()
-            config['auth_database'] = getattr(self, 'mongo_auth_db_edit', QLineEdit()).text() or 'admin'
-        elif db_type == 'PostgreSQL':
-            config['database'] = getattr(self, 'postgres_database_edit', QLineEdit()).text() or 'postgres'
-            config['schema'] = getattr(self, 'postgres_schema_edit', QLineEdit()).text() or 'public'
-        
-        return config
     
     def test_connection(self):
         """Test the database connection"""
         if not self.validate_inputs():
             return
         
+        # A test still in flight from an earlier click must not report over this one
+        self._drop_pending_test()
+        
         config = self.get_connection_config()
         
+        # An unchanged config that passed recently needs no new round trip
+        cached = ConnectionTestTask.cached_result(config)
+        if cached is not None:
+            success, message = cached
+            self.on_test_result(success, f"{message} (cached)")
+            return
+        
         # Disable test button during test
         self.test_btn.setEnabled(False)
         self.test_btn.setText("Testing!")
         
-        # Start connection test in separate thread
-        self.test_thread = ConnectionTestThread(config)
-        self.test_thread.result_ready.connect(self.on_test_result)
-        self.test_thread.start()
+        # Run the connection test on a persistent worker thread
+        self.test_task = ConnectionTestTask(config)
+        self.test_task.signals.result_ready.connect(self.on_test_result, Qt.QueuedConnection)
+        ConnectionTestTask.thread_pool().start(self.test_task)
+    
+    def _drop_pending_test(self):
+        """Stop listening to the previous connection test, if any"""
+        if self.test_task is None:
+            return
+        try:
+            self.test_task.signals.result_ready.disconnect(self.on_test_result)
+        except (TypeError, RuntimeError):
+            # Already disconnected
+            pass
+        self.test_task = None
     
     def on_test_result(self, success, message):
         """Handle connection test result"""
@@ -509,16 +850,20 @@ class ConnectionDialog(QDialog):
             QMessageBox.warning(self, "Connection Test Failed", message)
     
     def validate_inputs(self):
-        """Validate user inputs"""
-        if not self.name_edit.text().strip():
+        """Validate user inputs, keeping the stripped values for the caller"""
+        self._name = self.name_edit.text().strip()
+        self._host = self.hostname_edit.text().strip()
+        self._user = self.username_edit.text().strip()
+        
+        if not self._name:
             QMessageBox.warning(self, "Validation Error", "Please enter a connection name.")
             return False
         
-        if not self.hostname_edit.text().strip():
+        if not self._host:
             QMessageBox.warning(self, "Validation Error", "Please enter a hostname.")
             return False
         
-        if not self.username_edit.text().strip():
+        if not self._user:
             QMessageBox.warning(self, "Validation Error", "Please enter a username.")
             return False
         
@@ -529,7 +874,7 @@ class ConnectionDialog(QDialog):
         if not self.validate_inputs():
             return
         
-        connection_name = self.name_edit.text().strip()
+        connection_name = self._name
         config = self.get_connection_config()
         
         try:
@@ -556,15 +901,8 @@ class ConnectionDialog(QDialog):
                 
                 self.name_edit.setText(self.connection_name)
                 
-                # Map sub-types to UI display names
-                sub_type_to_display = {
-                    'mysql': 'MySQL',
-                    'mongodb': 'MongoDB',
-                    'postgres': 'PostgreSQL'
-                }
-                
                 sub_type = config.get('sub_type', 'mysql')
-                display_type = sub_type_to_display.get(sub_type, 'MySQL')
+                display_type = _DISPLAY_MAP.get(sub_type, 'MySQL')
                 self.type_combo.setCurrentText(display_type)
                 
                 self.hostname_edit.setText(config.get('host', ''))
@@ -2,16 +2,135 @@
 LLM Connection Dialog - LLM server configuration
 """
 
+import json
 import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Tuple
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
-    QLabel, QLineEdit, QComboBox, QPushButton, QSpinBox,
-    QGroupBox, QMessageBox, QCheckBox, QTextEdit, QProgressBar
+    QLabel, QLineEdit, QComboBox, QPushButton, QSpinBox, QDoubleSpinBox,
+    QGroupBox, QMessageBox, QCheckBox, QPlainTextEdit, QProgressBar
 )
-from PySide6.QtCore import Qt, QThread, Signal
-from PySide6.QtGui import QFont
+from PySide6.QtCore import Qt, QObject, QThread, QTimer, QUrl, Signal
+from PySide6.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+from PySide6.QtGui import QAction, QFont, QStandardItem, QStandardItemModel
 
 from llm.llm_client import LLMClient
+from llm.providers.base_provider import LLMConfig
+from llm.providers.github_copilot_provider import GitHubCopilotProvider
+from llm.providers.openai_provider import OpenAIProvider
+
+
+# Seconds a fetched model list is reused before asking the server again
+_MODELS_CACHE_TTL_S = 60
+
+# (sub_type, base_url[, api_key]) -> (monotonic timestamp, model list)
+_MODELS_CACHE = {}
+_MODELS_CACHE_LOCK = threading.Lock()
+
+
+# Matches the status in an HTTP error raised for a rejected API key
+_AUTH_ERROR = re.compile(r"\b40[13]\b")
+
+
+@dataclass(frozen=True)
+class _ProviderForm:
+    """How the dialog's form is set up for one provider sub-type"""
+    fields: Tuple[str, ...]  # Provider-specific rows to show
+    base_url: str
+    base_url_placeholder: str
+    api_key_placeholder: str
+    models: Tuple[str, ...]  # Default model list until models are loaded
+    load_models_label: str
+
+
+_PROVIDER_FORMS = {
+    'ollama': _ProviderForm(
+        fields=('host', 'port'),
+        base_url="",
+        base_url_placeholder="",
+        api_key_placeholder="",
+        models=("mistral:7b", "llama2:7b", "codellama:7b", "phi:2.7b", "neural-chat:7b"),
+        load_models_label="Load Available Models"
+    ),
+    'openai': _ProviderForm(
+        fields=('api_key', 'base_url'),
+        base_url="https://api.openai.com/v1",
+        base_url_placeholder="https://api.openai.com/v1",
+        api_key_placeholder="Enter your OpenAI API key",
+        models=("gpt-4o-mini", "gpt-4o", "gpt-4-turbo", "gpt-4", "gpt-3.5-turbo"),
+        load_models_label="Load OpenAI Models"
+    ),
+    'github': _ProviderForm(
+        fields=('api_key', 'base_url'),
+        base_url="https://models.inference.ai.azure.com",
+        base_url_placeholder="https://models.inference.ai.azure.com",
+        api_key_placeholder="Enter GitHub Personal Access Token (requires Copilot subscription)",
+        models=("gpt-4o", "gpt-4o-mini", "gpt-3.5-turbo"),  # gpt-3.5-turbo is the most likely to be available
+        load_models_label="Load Available Models"
+    )
+}
+
+# Config fields each connection test needs
+_OLLAMA_REQUIRED = frozenset({'host', 'port', 'model'})
+_OPENAI_REQUIRED = frozenset({'model', 'api_key', 'base_url', 'temperature', 'max_tokens', 'timeout'})
+
+# Values used for fields a stored LLM connection doesn't set
+_CONFIG_DEFAULTS = {
+    'model': '',
+    'temperature': 0.1,
+    'max_tokens': 1000,
+    'timeout': 180,
+    'host': 'localhost',
+    'port': 11434,
+    'api_key': '',
+    'base_url': ''
+}
+
+
+def _get_or_create_provider(cache, provider_class, config):
+    """Return the cached provider for config's endpoint and credentials.
+    
+    A cached provider is brought up to date with config's model and
+    generation parameters, so it keeps its warm session across those edits.
+    """
+    key = (config.provider, config.base_url, config.api_key)
+    provider = cache.get(key)
+    if provider is None:
+        provider = cache[key] = provider_class(config)
+    else:
+        provider.update_parameters(
+            model=config.model,
+            temperature=config.temperature,
+            max_tokens=config.max_tokens,
+            timeout=config.timeout
+        )
+    return provider
+
+
+def _cached_models(key):
+    """Return a still-fresh model list for a server, or None"""
+    with _MODELS_CACHE_LOCK:
+        entry = _MODELS_CACHE.get(key)
+    if entry and time.monotonic() - entry[0] < _MODELS_CACHE_TTL_S:
+        return entry[1]
+    return None
+
+
+def _store_models(key, models):
+    """Remember the model list fetched from a server"""
+    with _MODELS_CACHE_LOCK:
+        _MODELS_CACHE[key] = (time.monotonic(), models)
+
+
+def _forget_models(key):
+    """Drop a server's cached model list"""
+    with _MODELS_CACHE_LOCK:
+        _MODELS_CACHE.pop(key, None)
 
 
 class LLMTestThread(QThread):
@@ -19,11 +138,21 @@ class LLMTestThread(QThread):
     result_ready = Signal(bool, str)
     progress_update = Signal(str)
     
-    def __init__(self, llm_config, provider_sub_type="ollama"):
+    def __init__(self, llm_config, provider_sub_type="ollama", provider_cache=None, quick_test=False):
         super().__init__()
         self.llm_config = llm_config
         self.provider_sub_type = provider_sub_type
-        
+        # Optional dict shared across tests so providers and their sessions are reused
+        self.provider_cache = provider_cache
+        # Check access and models only, without a (possibly billed) generation
+        self.quick_test = quick_test
+    
+    def _get_or_create_provider(self, provider_class, config):
+        """Return a provider for config, reusing a cached one for the same endpoint"""
+        if self.provider_cache is None:
+            return provider_class(config)
+        return _get_or_create_provider(self.provider_cache, provider_class, config)
+    
     def run(self):
         """Test the LLM connection"""
         try:
@@ -45,10 +174,9 @@ class LLMTestThread(QThread):
         """Test Ollama connection"""
         try:
             # Validate required config fields first
-            required_fields = ['host', 'port', 'model']
-            missing_fields = [field for field in required_fields if field not in self.llm_config]
+            missing_fields = _OLLAMA_REQUIRED.difference(self.llm_config)
             if missing_fields:
-                self.result_ready.emit(False, f"Missing required config fields: {', '.join(missing_fields)}")
+                self.result_ready.emit(False, f"Missing required config fields: {', '.join(sorted(missing_fields))}")
                 return
             
             # Create LLM client
@@ -58,24 +186,41 @@ class LLMTestThread(QThread):
                 model=self.llm_config['model']
             )
             
-            # Test health check
+            # The test generation doesn't depend on the model listing, so
+            # start both at once; its result is only used if the checks pass
             self.progress_update.emit("Checking Ollama server health!")
-            if not client.health_check():
-                self.result_ready.emit(False, "Ollama server is not running or unreachable")
-                return
-            
-            # Test model availability
-            self.progress_update.emit("Checking model availability!")
-            models = client.list_models()
-            available_models = [model["name"] for model in models.get("models", [])]
-            
-            if self.llm_config['model'] not in available_models:
-                self.result_ready.emit(False, f"Model '{self.llm_config['model']}' not found. Available models: {', '.join(available_models)}")
-                return
-            
-            # Test generation
-            self.progress_update.emit("Testing text generation!")
-            response = client.generate("Hello, this is a test prompt.")
+            executor = ThreadPoolExecutor(max_workers=2)
+            try:
+                models_future = executor.submit(client.fetch_models)
+                if not self.quick_test:
+                    generation = executor.submit(client.generate, "Hello, this is a test prompt.")
+                
+                # A successful model listing also proves the server is healthy
+                models = models_future.result()
+                if models is None:
+                    self.result_ready.emit(False, "Ollama server is not running or unreachable")
+                    return
+                
+                # Test model availability
+                self.progress_update.emit("Checking model availability!")
+                model_names = [model["name"] for model in models.get("models", ())]
+                _store_models(("ollama", client.base_url), model_names)
+                available_models = set(model_names)
+                
+                if self.llm_config['model'] not in available_models:
+                    self.result_ready.emit(False, f"Model '{self.llm_config['model']}' not found. Available models: {', '.join(sorted(available_models))}")
+                    return
+                
+                if self.quick_test:
+                    self.result_ready.emit(True, "Ollama server and model OK (generation skipped).")
+                    return
+                
+                # Test generation
+                self.progress_update.emit("Testing text generation!")
+                response = generation.result()
+            finally:
+                # Don't hold the thread for a generation whose result is unused
+                executor.shutdown(wait=False)
             
             if response.success:
                 self.result_ready.emit(True, f"Ollama connection successful! Generated {response.tokens_used} tokens.")
@@ -87,89 +232,189 @@ class LLMTestThread(QThread):
     
     def _test_openai(self):
         """Test OpenAI connection"""
-        try:
-            from llm.providers.openai_provider import OpenAIProvider
-            from llm.providers.base_provider import LLMConfig
-            
-            # Validate required config fields first
-            required_fields = ['model', 'api_key', 'base_url', 'temperature', 'max_tokens', 'timeout']
-            missing_fields = [field for field in required_fields if field not in self.llm_config]
-            if missing_fields:
-                self.result_ready.emit(False, f"Missing required config fields: {', '.join(missing_fields)}")
-                return
-            
-            config = LLMConfig(
-                provider="openai",
-                model=self.llm_config['model'],
-                api_key=self.llm_config['api_key'],
-                base_url=self.llm_config['base_url'],
-                temperature=self.llm_config['temperature'],
-                max_tokens=self.llm_config['max_tokens'],
-                timeout=self.llm_config['timeout']
-            )
-            
-            provider = OpenAIProvider(config)
-            
-            # Test health check
-            self.progress_update.emit("Testing OpenAI API access!")
-            if not provider.health_check():
-                self.result_ready.emit(False, "Cannot access OpenAI API. Please check your API key.")
-                return
-            
-            # Test generation
-            self.progress_update.emit("Testing text generation with OpenAI!")
-            response = provider.generate("Hello, this is a test prompt.")
-            
-            if response.success:
-                self.result_ready.emit(True, f"OpenAI connection successful! Generated {response.tokens_used} tokens using {response.model}.")
-            else:
-                self.result_ready.emit(False, f"Generation test failed: {response.error}")
-                
-        except Exception as e:
-            self.result_ready.emit(False, f"OpenAI test error: {str(e)}")
+        self._test_openai_compatible(
+            OpenAIProvider, "openai", "OpenAI",
+            auth_message="Cannot access OpenAI API. Please check your API key."
+        )
     
     def _test_github_copilot(self):
         """Test GitHub Copilot connection"""
+        # The provider already turns 401/403 answers into token and subscription hints
+        self._test_openai_compatible(GitHubCopilotProvider, "github_copilot", "GitHub Copilot")
+    
+    def _test_openai_compatible(self, provider_class, provider_name, display_name, auth_message=None):
+        """Test a provider that speaks the OpenAI chat completions API.
+        
+        auth_message replaces the generation error when the server rejected
+        the API key with a 401 or 403.
+        """
         try:
-            from llm.providers.github_copilot_provider import GitHubCopilotProvider
-            from llm.providers.base_provider import LLMConfig
-            
             # Validate required config fields first
-            required_fields = ['model', 'api_key', 'base_url', 'temperature', 'max_tokens', 'timeout']
-            missing_fields = [field for field in required_fields if field not in self.llm_config]
+            missing_fields = _OPENAI_REQUIRED.difference(self.llm_config)
             if missing_fields:
-                self.result_ready.emit(False, f"Missing required config fields: {', '.join(missing_fields)}")
+                self.result_ready.emit(False, f"Missing required config fields: {', '.join(sorted(missing_fields))}")
                 return
             
             config = LLMConfig(
-                provider="github_copilot",
-                model=self.llm_config['model'],
-                api_key=self.llm_config['api_key'],
-                base_url=self.llm_config['base_url'],
-                temperature=self.llm_config['temperature'],
-                max_tokens=self.llm_config['max_tokens'],
-                timeout=self.llm_config['timeout']
+                provider=provider_name,
+                **{field: self.llm_config[field] for field in _OPENAI_REQUIRED}
             )
+            provider = self._get_or_create_provider(provider_class, config)
             
-            provider = GitHubCopilotProvider(config)
-            
-            # Test health check
-            self.progress_update.emit("Testing GitHub Copilot API access!")
-            if not provider.health_check():
-                self.result_ready.emit(False, "Cannot access GitHub Copilot API. Please check your token and subscription.")
+            if self.quick_test:
+                # Usually answered from the prewarmed health check
+                self.progress_update.emit(f"Testing {display_name} API access!")
+                if provider.health_check():
+                    self.result_ready.emit(True, f"{display_name} API access OK (generation skipped).")
+                else:
+                    self.result_ready.emit(False, f"Cannot access {display_name} API. Please check your API key.")
                 return
             
-            # Test generation
-            self.progress_update.emit("Testing text generation with GitHub Copilot!")
+            # The generation request checks the API key as well, so no
+            # separate health check round trip is needed
+            self.progress_update.emit(f"Testing text generation with {display_name}!")
             response = provider.generate("Hello, this is a test prompt.")
             
             if response.success:
-                self.result_ready.emit(True, f"GitHub Copilot connection successful! Generated {response.tokens_used} tokens using {response.model}.")
+                self.result_ready.emit(True, f"{display_name} connection successful! Generated {response.tokens_used} tokens using {response.model}.")
+            elif auth_message and _AUTH_ERROR.search(response.error or ""):
+                self.result_ready.emit(False, auth_message)
             else:
                 self.result_ready.emit(False, f"Generation test failed: {response.error}")
                 
         except Exception as e:
-            self.result_ready.emit(False, f"GitHub Copilot test error: {str(e)}")
+            self.result_ready.emit(False, f"{display_name} test error: {str(e)}")
+
+
+class OllamaConnectionTest(QObject):
+    """Ollama connection test driven by Qt's network stack on the UI thread.
+    
+    Exposes the same signals and isRunning() as LLMTestThread, without
+    starting a thread for what is only two small HTTP requests.
+    """
+    result_ready = Signal(bool, str)
+    progress_update = Signal(str)
+    
+    # Transfer timeouts in milliseconds, matching LLMClient
+    TAGS_TIMEOUT_MS = 5000
+    GENERATE_TIMEOUT_MS = 180000
+    
+    def __init__(self, llm_config, network_manager, quick_test=False):
+        super().__init__()
+        self.llm_config = llm_config
+        self.network_manager = network_manager
+        self.quick_test = quick_test
+        self._running = False
+        self._models_checked = False
+        self._base_url = None
+        self._tags_reply = None
+        self._generate_reply = None
+    
+    def isRunning(self):
+        """Return True until the result has been emitted"""
+        return self._running
+    
+    def start(self):
+        """Send the model listing and test generation requests"""
+        self.progress_update.emit("Testing OLLAMA connection!")
+        
+        # Validate required config fields first
+        missing_fields = _OLLAMA_REQUIRED.difference(self.llm_config)
+        if missing_fields:
+            self.result_ready.emit(False, f"Missing required config fields: {', '.join(sorted(missing_fields))}")
+            return
+        
+        self._running = True
+        client = LLMClient(
+            host=self.llm_config['host'],
+            port=self.llm_config['port'],
+            model=self.llm_config['model']
+        )
+        
+        # The test generation doesn't depend on the model listing, so send
+        # both at once; its result is only used if the checks pass
+        self.progress_update.emit("Checking Ollama server health!")
+        self._base_url = client.base_url
+        tags_request = QNetworkRequest(QUrl(f"{client.base_url}/api/tags"))
+        tags_request.setTransferTimeout(self.TAGS_TIMEOUT_MS)
+        self._tags_reply = self.network_manager.get(tags_request)
+        self._tags_reply.finished.connect(self._on_tags_finished)
+        if self.quick_test:
+            return
+        
+        generate_request = QNetworkRequest(QUrl(f"{client.base_url}/api/generate"))
+        generate_request.setHeader(QNetworkRequest.ContentTypeHeader, "application/json")
+        generate_request.setTransferTimeout(self.GENERATE_TIMEOUT_MS)
+        payload = client.build_generate_payload("Hello, this is a test prompt.")
+        self._generate_reply = self.network_manager.post(generate_request, json.dumps(payload).encode("utf-8"))
+        self._generate_reply.finished.connect(self._on_generate_finished)
+    
+    def _on_tags_finished(self):
+        """Check server health and model availability from /api/tags"""
+        reply, self._tags_reply = self._tags_reply, None
+        reply.deleteLater()
+        if not self._running:
+            return
+        
+        # A successful model listing also proves the server is healthy
+        if reply.error() != QNetworkReply.NoError:
+            self._finish(False, "Ollama server is not running or unreachable")
+            return
+        
+        # Test model availability
+        self.progress_update.emit("Checking model availability!")
+        # Valid JSON of the wrong shape must still end the test, or the
+        # Test button would stay disabled
+        try:
+            models = json.loads(bytes(reply.readAll()))
+            model_names = [model["name"] for model in models.get("models", ())]
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._finish(False, f"Ollama test error: unexpected /api/tags reply ({e!r})")
+            return
+        _store_models(("ollama", self._base_url), model_names)
+        available_models = set(model_names)
+        
+        if self.llm_config['model'] not in available_models:
+            self._finish(False, f"Model '{self.llm_config['model']}' not found. Available models: {', '.join(sorted(available_models))}")
+            return
+        
+        if self.quick_test:
+            self._finish(True, "Ollama server and model OK (generation skipped).")
+            return
+        
+        self._models_checked = True
+        self.progress_update.emit("Testing text generation!")
+        if self._generate_reply.isFinished():
+            self._on_generate_finished()
+    
+    def _on_generate_finished(self):
+        """Report the test generation once the model checks have passed"""
+        if not self._running or not self._models_checked:
+            return
+        reply, self._generate_reply = self._generate_reply, None
+        reply.deleteLater()
+        
+        if reply.error() != QNetworkReply.NoError:
+            self._finish(False, f"Generation test failed: {reply.errorString()}")
+            return
+        
+        try:
+            data = json.loads(bytes(reply.readAll()))
+            tokens_used = data.get("prompt_eval_count", 0) + data.get("eval_count", 0)
+        except (ValueError, TypeError, AttributeError) as e:
+            self._finish(False, f"Generation test failed: {str(e)}")
+            return
+        self._finish(True, f"Ollama connection successful! Generated {tokens_used} tokens.")
+    
+    def _finish(self, success, message):
+        """Emit the result and drop any request still in flight"""
+        self._running = False
+        for reply in (self._tags_reply, self._generate_reply):
+            if reply is not None:
+                reply.abort()
+                reply.deleteLater()
+        self._tags_reply = self._generate_reply = None
+        self.result_ready.emit(success, message)
 
 
 class LLMConnectionDialog(QDialog):
@@ -181,7 +426,11 @@ class LLMConnectionDialog(QDialog):
         self.connection_name = connection_name
         self.logger = logging.getLogger(__name__)
         self.test_thread = None
-        self._github_copilot_info_shown = False  # Track if we've shown the info dialog
+        self.network_manager = None  # Created by the first Ollama test
+        # (provider, base_url, api_key) -> provider reused by later tests
+        self._provider_cache = {}
+        self._github_info_msg = None  # GitHub Copilot notice, built when first shown
+        self._last_provider_type = None  # Provider the form was last set up for
         
         self.setWindowTitle("Setup LLM Connection" if not connection_name else f"Edit LLM Connection: {connection_name}")
         self.setModal(True)
@@ -211,28 +460,51 @@ class LLMConnectionDialog(QDialog):
         # Provider sub-type
         self.provider_type = QComboBox()
         self.provider_type.addItems(["ollama", "openai", "github"])
-        self.provider_type.currentTextChanged.connect(self.on_provider_type_changed)
+        # Debounced so arrowing through the list only applies the final choice
+        self._provider_type_timer = QTimer(self)
+        self._provider_type_timer.setSingleShot(True)
+        self._provider_type_timer.setInterval(150)
+        self._provider_type_timer.timeout.connect(
+            lambda: self.on_provider_type_changed(self.provider_type.currentText())
+        )
+        self.provider_type.currentTextChanged.connect(self._on_provider_type_changed_debounced)
         self.provider_layout.addRow("Provider Sub-Type:", self.provider_type)
         
         # API Key (for external providers)
         self.api_key_edit = QLineEdit()
         self.api_key_edit.setEchoMode(QLineEdit.Password)
         self.api_key_edit.setPlaceholderText("Enter your API key or GitHub token")
-        self.provider_layout.addRow("API Key:", self.api_key_edit)
+        api_key_label = QLabel("API Key:")
+        self.provider_layout.addRow(api_key_label, self.api_key_edit)
+        self.api_key_edit.textChanged.connect(self._forget_providers)
+        self.api_key_edit.editingFinished.connect(self._prewarm_provider)
         
         # Base URL
         self.base_url_edit = QLineEdit()
-        self.provider_layout.addRow("Base URL:", self.base_url_edit)
+        base_url_label = QLabel("Base URL:")
+        self.provider_layout.addRow(base_url_label, self.base_url_edit)
+        self.base_url_edit.textChanged.connect(self._forget_providers)
+        self.base_url_edit.editingFinished.connect(self._prewarm_provider)
         
         # Host (for Ollama)
         self.host_edit = QLineEdit("localhost")
-        self.provider_layout.addRow("Host:", self.host_edit)
+        host_label = QLabel("Host:")
+        self.provider_layout.addRow(host_label, self.host_edit)
         
         # Port (for Ollama)
         self.port_spin = QSpinBox()
         self.port_spin.setRange(1, 65535)
         self.port_spin.setValue(11434)
-        self.provider_layout.addRow("Port:", self.port_spin)
+        port_label = QLabel("Port:")
+        self.provider_layout.addRow(port_label, self.port_spin)
+        
+        # Provider-specific rows, shown or hidden as the provider changes
+        self._provider_rows = {
+            'api_key': (api_key_label, self.api_key_edit),
+            'base_url': (base_url_label, self.base_url_edit),
+            'host': (host_label, self.host_edit),
+            'port': (port_label, self.port_spin)
+        }
         
         # Model
         self.model_combo = QComboBox()
@@ -241,7 +513,13 @@ class LLMConnectionDialog(QDialog):
         
         # Load models button
         self.load_models_btn = QPushButton("Load Available Models")
-        self.load_models_btn.clicked.connect(self.load_available_models)
+        self.load_models_btn.clicked.connect(lambda: self.load_available_models())
+        
+        # Right-click to bypass the model list cache
+        refresh_action = QAction("Refresh Models", self.load_models_btn)
+        refresh_action.triggered.connect(lambda: self.load_available_models(refresh=True))
+        self.load_models_btn.addAction(refresh_action)
+        self.load_models_btn.setContextMenuPolicy(Qt.ActionsContextMenu)
         self.provider_layout.addRow("", self.load_models_btn)
         
         layout.addWidget(provider_group)
@@ -251,10 +529,11 @@ class LLMConnectionDialog(QDialog):
         params_layout = QFormLayout(params_group)
         
         # Temperature
-        self.temperature_spin = QSpinBox()
-        self.temperature_spin.setRange(0, 200)
-        self.temperature_spin.setValue(10)
-        self.temperature_spin.setSuffix("%")
+        self.temperature_spin = QDoubleSpinBox()
+        self.temperature_spin.setRange(0.0, 2.0)
+        self.temperature_spin.setSingleStep(0.05)
+        self.temperature_spin.setDecimals(2)
+        self.temperature_spin.setValue(0.1)
         params_layout.addRow("Temperature:", self.temperature_spin)
         
         # Max Tokens
@@ -281,6 +560,9 @@ class LLMConnectionDialog(QDialog):
         self.test_btn = QPushButton("Test Connection")
         self.test_btn.clicked.connect(self.test_connection)
         test_button_layout.addWidget(self.test_btn)
+        self.quick_test_check = QCheckBox("Quick test (no generation)")
+        self.quick_test_check.setToolTip("Check server access and the model list without generating text")
+        test_button_layout.addWidget(self.quick_test_check)
         test_button_layout.addStretch()
         
         self.progress_bar = QProgressBar()
@@ -290,9 +572,11 @@ class LLMConnectionDialog(QDialog):
         test_layout.addLayout(test_button_layout)
         
         # Test results
-        self.test_result = QTextEdit()
+        self.test_result = QPlainTextEdit()
         self.test_result.setMaximumHeight(80)
         self.test_result.setReadOnly(True)
+        # Keep appends cheap however many progress lines a test produces
+        self.test_result.setMaximumBlockCount(200)
         test_layout.addWidget(self.test_result)
         
         layout.addWidget(test_group)
@@ -315,105 +599,42 @@ class LLMConnectionDialog(QDialog):
         # Initialize provider-specific settings
         self.on_provider_type_changed("ollama")
     
+    def _on_provider_type_changed_debounced(self, provider_type: str):
+        """Restart the debounce timer; the change applies once selection settles"""
+        self._provider_type_timer.start()
+    
     def on_provider_type_changed(self, provider_type: str):
         """Handle provider type change"""
-        # Clear current models
-        self.model_combo.clear()
-        
-        if provider_type == "ollama":
-            # Show Ollama-specific fields
-            self.api_key_edit.setVisible(False)
-            self.host_edit.setVisible(True)
-            self.port_spin.setVisible(True)
-            self.base_url_edit.setVisible(False)
-            
-            # Hide labels for invisible fields
-            for i in range(self.provider_layout.rowCount()):
-                label = self.provider_layout.itemAt(i, QFormLayout.LabelRole)
-                if label and label.widget():
-                    label_text = label.widget().text()
-                    if "API Key:" in label_text:
-                        label.widget().setVisible(False)
-                    elif "Base URL:" in label_text:
-                        label.widget().setVisible(False)
-                    else:
-                        label.widget().setVisible(True)
-            
-            # Set Ollama defaults
-            self.base_url_edit.setText("")
-            self.model_combo.addItems([
-                "mistral:7b",
-                "llama2:7b", 
-                "codellama:7b",
-                "phi:2.7b",
-                "neural-chat:7b"
-            ])
-            self.load_models_btn.setText("Load Available Models")
-            
-        elif provider_type == "openai":
-            # Show OpenAI-specific fields
-            self.api_key_edit.setVisible(True)
-            self.host_edit.setVisible(False)
-            self.port_spin.setVisible(False)
-            self.base_url_edit.setVisible(True)
-            
-            # Show labels for visible fields
-            for i in range(self.provider_layout.rowCount()):
-                label = self.provider_layout.itemAt(i, QFormLayout.LabelRole)
-                if label and label.widget():
-                    label_text = label.widget().text()
-                    if "Host:" in label_text or "Port:" in label_text:
-                        label.widget().setVisible(False)
-                    else:
-                        label.widget().setVisible(True)
-            
-            # Set OpenAI defaults
-            self.base_url_edit.setText("https://api.openai.com/v1")
-            self.base_url_edit.setPlaceholderText("https://api.openai.com/v1")
-            self.api_key_edit.setPlaceholderText("Enter your OpenAI API key")
-            self.model_combo.addItems([
-                "gpt-4o-mini",
-                "gpt-4o",
-                "gpt-4-turbo",
-                "gpt-4",
-                "gpt-3.5-turbo"
-            ])
-            self.load_models_btn.setText("Load OpenAI Models")
-            
-        elif provider_type == "github":
-            # Show GitHub Copilot-specific fields
-            self.api_key_edit.setVisible(True)
-            self.host_edit.setVisible(False)
-            self.port_spin.setVisible(False)
-            self.base_url_edit.setVisible(True)
-            
-            # Show labels for visible fields
-            for i in range(self.provider_layout.rowCount()):
-                label = self.provider_layout.itemAt(i, QFormLayout.LabelRole)
-                if label and label.widget():
-                    label_text = label.widget().text()
-                    if "Host:" in label_text or "Port:" in label_text:
-                        label.widget().setVisible(False)
-                    else:
-                        label.widget().setVisible(True)
-            
-            # Set GitHub Copilot defaults
-            self.base_url_edit.setText("https://models.inference.ai.azure.com")
-            self.base_url_edit.setPlaceholderText("https://models.inference.ai.azure.com")
-            self.api_key_edit.setPlaceholderText("Enter GitHub Personal Access Token (requires Copilot subscription)")
-            self.model_combo.addItems([
-                "gpt-4o",
-                "gpt-4o-mini",
-                "gpt-3.5-turbo"  # More likely to be available
-            ])
-            self.load_models_btn.setText("Load Available Models")
-            
+        # Applied now, so a pending debounced change would only repeat it
+        self._provider_type_timer.stop()
+        
+        # Re-selecting the current provider would only reset the form
+        if provider_type == self._last_provider_type:
+            return
+        self._last_provider_type = provider_type
+        self._forget_providers()
+        
+        form = _PROVIDER_FORMS.get(provider_type)
+        
+        # Show only the rows this provider uses
+        visible_fields = form.fields if form else ()
+        for field, row_widgets in self._provider_rows.items():
+            for widget in row_widgets:
+                widget.setVisible(field in visible_fields)
+        
+        # Reset the provider defaults
+        self._show_model_choices(form.models if form else ())
+        if form is None:
+            return
+        self.base_url_edit.setText(form.base_url)
+        self.base_url_edit.setPlaceholderText(form.base_url_placeholder)
+        self.api_key_edit.setPlaceholderText(form.api_key_placeholder)
+        self.load_models_btn.setText(form.load_models_label)
+        
+        if provider_type == "github":
             # Show information about GitHub Copilot limitations (once per session)
-            if not self._github_copilot_info_shown:
-                self._github_copilot_info_shown = True
-                from PySide6.QtWidgets import QCheckBox
-                
-                msg = QMessageBox(self)
+            if self._github_info_msg is None:
+                msg = self._github_info_msg = QMessageBox(self)
                 msg.setWindowTitle("GitHub Copilot Setup")
                 msg.setIcon(QMessageBox.Information)
                 msg.setText(
@@ -427,149 +648,248 @@ class LLMConnectionDialog(QDialog):
                 )
                 msg.setStandardButtons(QMessageBox.Ok)
                 msg.exec()
+        
+        # A key may already be filled in from the previous provider or a loaded config
+        self._prewarm_provider()
     
-    def load_available_models(self):
-        """Load available models from the provider"""
+    def load_available_models(self, refresh=False):
+        """Load available models from the provider.
+        
+        Lists fetched within the cache TTL are reused unless refresh is set.
+        """
+        self._apply_pending_provider_change()
         provider_type = self.provider_type.currentText()
         
         try:
             if provider_type == "ollama":
-                self._load_ollama_models()
+                self._load_ollama_models(refresh)
             elif provider_type == "openai":
-                self._load_openai_models()
-            elif provider_type == "github_copilot":
-                self._load_github_copilot_models()
+                self._load_openai_models(refresh)
+            elif provider_type == "github":
+                self._load_github_copilot_models(refresh)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load models: {str(e)}")
     
-    def _load_ollama_models(self):
-        """Load Ollama models"""
-        client = LLMClient(
-            host=self.host_edit.text(),
-            port=self.port_spin.value()
-        )
+    @staticmethod
+    def _model_choices(models):
+        """Turn a provider's list_models() result into (display name, id) pairs"""
+        choices = []
+        for model in models.get("models", []):
+            # Use friendly_name or name for display, but store id as value
+            display_name = model.get("friendly_name") or model.get("name") or model.get("id", "")
+            model_id = model.get("id", display_name)
+            if display_name:
+                choices.append((display_name, model_id))
+        return choices
+    
+    def _show_model_choices(self, choices):
+        """Replace the model list with model names or (display name, id) pairs.
         
-        if not client.health_check():
-            QMessageBox.warning(self, "Connection Error", "Cannot connect to Ollama server. Please check host and port.")
-            return
+        The items are built into a detached model that replaces the combo's
+        model in one step, so long lists cause a single model reset instead
+        of a row insertion, currentIndexChanged and relayout per item.
+        """
+        items = []
+        for choice in choices:
+            if isinstance(choice, str):
+                items.append(QStandardItem(choice))
+            else:
+                display_name, model_id = choice
+                item = QStandardItem(display_name)
+                item.setData(model_id, Qt.UserRole)
+                items.append(item)
+        # Parented to the combo, so the next setModel() deletes it
+        model = QStandardItemModel(self.model_combo)
+        model.appendColumn(items)
         
-        models = client.list_models()
-        available_models = [model["name"] for model in models.get("models", [])]
+        combo = self.model_combo
+        combo.blockSignals(True)
+        combo.setUpdatesEnabled(False)
+        try:
+            combo.setModel(model)
+            combo.setCurrentIndex(0 if items else -1)
+        finally:
+            combo.setUpdatesEnabled(True)
+            combo.blockSignals(False)
+    
+    def _load_ollama_models(self, refresh=False):
+        """Load Ollama models"""
+        client = LLMClient(host=self.host_edit.text(), port=self.port_spin.value())
+        key = ("ollama", client.base_url)
+        
+        available_models = None if refresh else _cached_models(key)
+        if available_models is None:
+            # A successful model listing also proves the server is healthy
+            models = client.fetch_models()
+            if models is None:
+                QMessageBox.warning(self, "Connection Error", "Cannot connect to Ollama server. Please check host and port.")
+                return
+            
+            available_models = [model["name"] for model in models.get("models", [])]
+            _store_models(key, available_models)
         
         if available_models:
-            self.model_combo.clear()
-            self.model_combo.addItems(available_models)
+            self._show_model_choices(available_models)
             QMessageBox.information(self, "Success", f"Loaded {len(available_models)} models from Ollama server.")
         else:
             QMessageBox.warning(self, "No Models", "No models found on the Ollama server.")
     
-    def _load_openai_models(self):
+    def _load_openai_models(self, refresh=False):
         """Load OpenAI models"""
         api_key = self.api_key_edit.text().strip()
         if not api_key:
             QMessageBox.warning(self, "API Key Required", "Please enter your OpenAI API key first.")
             return
         
-        # Use the OpenAI provider to load models
-        from llm.providers.openai_provider import OpenAIProvider
-        from llm.providers.base_provider import LLMConfig
+        base_url = self._current_base_url("openai")
+        key = ("openai", base_url, api_key)
         
-        config = LLMConfig(
-            provider="openai",
-            model="gpt-4o-mini",
-            api_key=api_key,
-            base_url=self.base_url_edit.text() or "https://api.openai.com/v1"
-        )
-        
-        provider = OpenAIProvider(config)
-        if provider.health_check():
-            models = provider.list_models()
-            available_models = []
-            for model in models.get("models", []):
-                # Use name or friendly_name for display, but store id as value
-                display_name = model.get("friendly_name") or model.get("name") or model.get("id", "")
-                model_id = model.get("id", display_name)
-                if display_name:
-                    available_models.append((display_name, model_id))
+        available_models = None if refresh else _cached_models(key)
+        if available_models is None:
+            # Reuse the provider a connection test would use, so its session
+            # is shared and released when the endpoint or credentials change
+            provider = _get_or_create_provider(self._provider_cache, OpenAIProvider, LLMConfig(
+                provider="openai",
+                model="gpt-4o-mini",
+                api_key=api_key,
+                base_url=base_url
+            ))
+            if refresh:
+                provider.invalidate_cache()
+            if not provider.health_check():
+                QMessageBox.warning(self, "Connection Error", "Cannot connect to OpenAI. Please check your API key.")
+                return
             
-            if available_models:
-                self.model_combo.clear()
-                for display_name, model_id in available_models:
-                    self.model_combo.addItem(display_name, model_id)
-                QMessageBox.information(self, "Success", f"Loaded {len(available_models)} OpenAI models.")
-            else:
-                QMessageBox.warning(self, "No Models", "No models available for your OpenAI account.")
+            available_models = self._model_choices(provider.list_models())
+            _store_models(key, available_models)
+        
+        if available_models:
+            self._show_model_choices(available_models)
+            QMessageBox.information(self, "Success", f"Loaded {len(available_models)} OpenAI models.")
         else:
-            QMessageBox.warning(self, "Connection Error", "Cannot connect to OpenAI. Please check your API key.")
+            QMessageBox.warning(self, "No Models", "No models available for your OpenAI account.")
     
-    def _load_github_copilot_models(self):
+    def _load_github_copilot_models(self, refresh=False):
         """Load GitHub Copilot models"""
         token = self.api_key_edit.text().strip()
         if not token:
             QMessageBox.warning(self, "Token Required", "Please enter your GitHub Personal Access Token first.")
             return
         
-        # Use the GitHub Copilot provider to load models
-        from llm.providers.github_copilot_provider import GitHubCopilotProvider
-        from llm.providers.base_provider import LLMConfig
+        base_url = self._current_base_url("github")
+        key = ("github", base_url, token)
         
-        config = LLMConfig(
-            provider="github_copilot",
-            model="gpt-4o",
-            api_key=token,
-            base_url=self.base_url_edit.text() or "https://models.inference.ai.azure.com"
-        )
-        
-        provider = GitHubCopilotProvider(config)
-        if provider.health_check():
-            models = provider.list_models()
-            available_models = []
-            for model in models.get("models", []):
-                # Use friendly_name or name for display, but store id as value
-                display_name = model.get("friendly_name") or model.get("name") or model.get("id", "")
-                model_id = model.get("id", display_name)
-                if display_name:
-                    available_models.append((display_name, model_id))
+        available_models = None if refresh else _cached_models(key)
+        if available_models is None:
+            # Reuse the provider a connection test would use, so its session
+            # is shared and released when the endpoint or credentials change
+            provider = _get_or_create_provider(self._provider_cache, GitHubCopilotProvider, LLMConfig(
+                provider="github_copilot",
+                model="gpt-4o",
+                api_key=token,
+                base_url=base_url
+            ))
+            if refresh:
+                provider.invalidate_cache()
+            if not provider.health_check():
+                QMessageBox.warning(
+                    self, 
+                    "GitHub Copilot Access", 
+                    "Cannot connect to GitHub Copilot API. This may be due to:\n\n"
+                    "1. GitHub Personal Access Token is invalid\n"
+                    "2. No active GitHub Copilot subscription\n"
+                    "3. GitHub Copilot API requires special permissions\n\n"
+                    "Note: GitHub Copilot's chat API is not publicly available like OpenAI's API. "
+                    ""
+                )
+                return
             
-            if available_models:
-                self.model_combo.clear()
-                for display_name, model_id in available_models:
-                    self.model_combo.addItem(display_name, model_id)
-                QMessageBox.information(self, "Success", f"Loaded {len(available_models)} GitHub Copilot models.")
-            else:
-                # Use supported models as fallback
-                QMessageBox.information(self, "Models Available", "Using supported model list.")
+            available_models = self._model_choices(provider.list_models())
+            _store_models(key, available_models)
+        
+        if available_models:
+            self._show_model_choices(available_models)
+            QMessageBox.information(self, "Success", f"Loaded {len(available_models)} GitHub Copilot models.")
         else:
-            QMessageBox.warning(
-                self, 
-                "GitHub Copilot Access", 
-                "Cannot connect to GitHub Copilot API. This may be due to:\n\n"
-                "1. GitHub Personal Access Token is invalid\n"
-                "2. No active GitHub Copilot subscription\n"
-                "3. GitHub Copilot API requires special permissions\n\n"
-                "Note: GitHub Copilot's chat API is not publicly available like OpenAI's API. "
-                ""
-            )
+            # Use supported models as fallback
+            QMessageBox.information(self, "Models Available", "Using supported model list.")
+    
+    def _apply_pending_provider_change(self):
+        """Apply a provider change still waiting on the debounce timer"""
+        if self._provider_type_timer.isActive():
+            self.on_provider_type_changed(self.provider_type.currentText())
     
     def test_connection(self):
         """Test the LLM connection"""
         if self.test_thread and self.test_thread.isRunning():
             return
         
+        self._apply_pending_provider_change()
+        
         provider_sub_type = self.provider_type.currentText()
         config = self._get_current_config()
+        quick_test = self.quick_test_check.isChecked()
         
         self.test_btn.setEnabled(False)
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)  # Indeterminate progress
         self.test_result.clear()
         
-        self.test_thread = LLMTestThread(config, provider_sub_type)
+        if provider_sub_type == "ollama":
+            # Plain HTTP calls; let Qt's network stack run them without a thread
+            if self.network_manager is None:
+                self.network_manager = QNetworkAccessManager(self)
+            self.test_thread = OllamaConnectionTest(config, self.network_manager, quick_test)
+        else:
+            self.test_thread = LLMTestThread(config, provider_sub_type, self._provider_cache, quick_test)
         self.test_thread.result_ready.connect(self.on_test_result)
         self.test_thread.progress_update.connect(self.on_progress_update)
         
         self.test_thread.start()
     
+    def _prewarm_provider(self):
+        """Open the provider's connection in the background before a test.
+        
+        Warms up the provider a test would reuse, so its keep-alive socket
+        to the generation endpoint is connected and its health check result
+        is cached by the time the user clicks Test.
+        """
+        provider_sub_type = self.provider_type.currentText()
+        provider_class = {"openai": OpenAIProvider, "github": GitHubCopilotProvider}.get(provider_sub_type)
+        config = self._get_current_config()
+        if provider_class is None or not config['api_key'].strip() or not config['base_url']:
+            return
+        
+        try:
+            provider = _get_or_create_provider(self._provider_cache, provider_class, LLMConfig(
+                provider="openai" if provider_sub_type == "openai" else "github_copilot",
+                model=config['model'],
+                api_key=config['api_key'],
+                base_url=config['base_url'],
+                temperature=config['temperature'],
+                max_tokens=config['max_tokens'],
+                timeout=config['timeout']
+            ))
+        except Exception as e:
+            self.logger.debug(f"Skipping provider prewarm: {e}")
+            return
+        threading.Thread(target=provider.warm_up, name="provider-prewarm", daemon=True).start()
+    
+    def _forget_providers(self, *_):
+        """Close and drop cached test providers once the endpoint or credentials change"""
+        providers = list(self._provider_cache.values())
+        self._provider_cache.clear()
+        for provider in providers:
+            try:
+                provider.close()
+            except Exception as e:
+                self.logger.debug(f"Error closing cached provider: {e}")
+    
+    def _current_base_url(self, provider_sub_type):
+        """Return the entered base URL, or the provider's default when blank"""
+        form = _PROVIDER_FORMS.get(provider_sub_type)
+        return self.base_url_edit.text().strip() or (form.base_url if form else "")
+    
     def _get_current_config(self):
         """Get current configuration based on provider sub-type"""
         provider_sub_type = self.provider_type.currentText()
@@ -582,7 +902,7 @@ class LLMConnectionDialog(QDialog):
         config = {
             'sub_type': provider_sub_type,  # Use sub_type
             'model': model_id,
-            'temperature': self.temperature_spin.value() / 100.0,
+            'temperature': self.temperature_spin.value(),
             'max_tokens': self.max_tokens_spin.value(),
             'timeout': self.timeout_spin.value()
         }
@@ -596,19 +916,19 @@ class LLMConnectionDialog(QDialog):
         elif provider_sub_type == "github":
             config.update({
                 'api_key': self.api_key_edit.text(),  # Use api_key consistently
-                'base_url': self.base_url_edit.text()
+                'base_url': self._current_base_url(provider_sub_type)
             })
         else:  # openai
             config.update({
                 'api_key': self.api_key_edit.text(),
-                'base_url': self.base_url_edit.text()
+                'base_url': self._current_base_url(provider_sub_type)
             })
         
         return config
     
     def on_progress_update(self, message):
         """Handle progress updates"""
-        self.test_result.append(message)
+        self.test_result.appendPlainText(message)
     
     def on_test_result(self, success, message):
         """Handle test results"""
@@ -616,14 +936,16 @@ class LLMConnectionDialog(QDialog):
         self.progress_bar.setVisible(False)
         
         if success:
-            self.test_result.append(f"✓ {message}")
+            self.test_result.appendPlainText(f"✓ {message}")
             self.test_result.setStyleSheet("color: green;")
         else:
-            self.test_result.append(f"✗ {message}")
+            self.test_result.appendPlainText(f"✗ {message}")
             self.test_result.setStyleSheet("color: red;")
     
     def save_connection(self):
         """Save the LLM connection with new type/sub-type structure"""
+        self._apply_pending_provider_change()
+        
         name = self.name_edit.text().strip()
         if not name:
             QMessageBox.warning(self, "Validation Error", "Connection name is required.")
@@ -646,7 +968,7 @@ class LLMConnectionDialog(QDialog):
             'type': 'LLM',  # New connection type
             'sub_type': provider_sub_type,  # New sub-type field
             'model': model_id,
-            'temperature': self.temperature_spin.value() / 100.0,
+            'temperature': self.temperature_spin.value(),
             'max_tokens': self.max_tokens_spin.value(),
             'timeout': self.timeout_spin.value(),
             'enabled': True  # Default to enabled
@@ -660,17 +982,21 @@ class LLMConnectionDialog(QDialog):
         elif provider_sub_type == "openai":
             config.update({
                 'api_key': self.api_key_edit.text(),
-                'base_url': self.base_url_edit.text() or "https://api.openai.com/v1"
+                'base_url': self._current_base_url(provider_sub_type)
             })
         elif provider_sub_type == "github":
             config.update({
                 'api_key': self.api_key_edit.text(),  # Use api_key consistently
-                'base_url': self.base_url_edit.text() or "https://models.inference.ai.azure.com"
+                'base_url': self._current_base_url(provider_sub_type)
             })
         
         try:
             # Save to config manager
             self.config_manager.save_connection(name, config)
+            if provider_sub_type == "ollama":
+                _forget_models(("ollama", f"http://{config['host']}:{config['port']}"))
+            else:
+                _forget_models((provider_sub_type, config['base_url'], config['api_key']))
             self.accept()
         except Exception as e:
             QMessageBox.critical(self, "Save Error", f"Failed to save connection: {str(e)}")
@@ -681,6 +1007,7 @@ class LLMConnectionDialog(QDialog):
             connections = self.config_manager.get_connections()
             if self.connection_name in connections:
                 config = connections[self.connection_name]
+                merged = {**_CONFIG_DEFAULTS, **config}
                 
                 self.name_edit.setText(self.connection_name)
                 
@@ -695,7 +1022,7 @@ class LLMConnectionDialog(QDialog):
                 self.on_provider_type_changed(provider_sub_type)
                 
                 # Set common fields
-                stored_model = config.get('model', '')
+                stored_model = merged['model']
                 
                 # Try to find the model in the combo box (either by display name or stored data)
                 model_index = -1
@@ -712,21 +1039,21 @@ class LLMConnectionDialog(QDialog):
                     # If not found, set as editable text (for custom models)
                     self.model_combo.setCurrentText(stored_model)
                 
-                self.temperature_spin.setValue(int(config.get('temperature', 0.1) * 100))
-                self.max_tokens_spin.setValue(config.get('max_tokens', 1000))
-                self.timeout_spin.setValue(config.get('timeout', 180))
+                self.temperature_spin.setValue(merged['temperature'])
+                self.max_tokens_spin.setValue(merged['max_tokens'])
+                self.timeout_spin.setValue(merged['timeout'])
                 
                 # Set provider-specific fields
                 if provider_sub_type == "ollama":
-                    self.host_edit.setText(config.get('host', 'localhost'))
-                    self.port_spin.setValue(config.get('port', 11434))
+                    self.host_edit.setText(merged['host'])
+                    self.port_spin.setValue(merged['port'])
                 elif provider_sub_type == "github":
                     # Handle both old 'token' field and new 'api_key' field for backward compatibility
-                    self.api_key_edit.setText(config.get('api_key') or config.get('token', ''))
-                    self.base_url_edit.setText(config.get('base_url', ''))
+                    self.api_key_edit.setText(merged['api_key'] or config.get('token', ''))
+                    self.base_url_edit.setText(merged['base_url'])
                 else:  # openai
-                    self.api_key_edit.setText(config.get('api_key', ''))
-                    self.base_url_edit.setText(config.get('base_url', ''))
+                    self.api_key_edit.setText(merged['api_key'])
+                    self.base_url_edit.setText(merged['base_url'])
                 
         except Exception as e:
             self.logger.error(f"Error loading connection config: {e}")
@@ -4,6 +4,7 @@ Main window for InsightPilot application
 
 import logging
 import os
+from functools import lru_cache
 from pathlib import Path
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
@@ -14,8 +15,35 @@ from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QAction, QIcon
 
 from config.config_manager import ConfigManager
-from .tabs import ConnectionsTab, QueryChatTab, ResultsTab, HistoryTab
-from .dialogs import ConnectionDialog
+
+
+# Stylesheets for the built-in themes; light is Qt's default look
+_DARK_QSS = """
+    QMainWindow {
+        background-color: #2b2b2b;
+        color: #ffffff;
+    }
+    QTabWidget::pane {
+        border: 1px solid #555555;
+        background-color: #3c3c3c;
+    }
+    QTabBar::tab {
+        background-color: #2b2b2b;
+        color: #ffffff;
+        padding: 8px 16px;
+        border: 1px solid #555555;
+    }
+    QTabBar::tab:selected {
+        background-color: #3c3c3c;
+    }
+"""
+_LIGHT_QSS = ""
+
+
+@lru_cache(maxsize=4)
+def _read_stylesheet(path: str, mtime_ns: int) -> str:
+    """Read a stylesheet file; the mtime key makes edits on disk load again"""
+    return Path(path).read_text(encoding="utf-8")
 
 
 class MainWindow(QMainWindow):
@@ -25,7 +53,6 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.config_manager = config_manager
         self.client_mode = client_mode
-        self.server_thread = None  # Reference to server thread if running in standalone mode
         self.logger = logging.getLogger(__name__)
         
         self.setWindowTitle("InsightPilot - AI-Powered Data Explorer")
@@ -69,22 +96,70 @@ class MainWindow(QMainWindow):
         splitter.setSizes([150, 850])  # More compact sidebar
     
     def setup_tabs(self):
-        """Set up the application tabs"""
+        """Set up the application tabs.
+        
+        Only the Connections tab is built up front; the others start as
+        placeholders and are built the first time they are shown.
+        """
+        from .tabs.connections_tab import ConnectionsTab
+        
         # Connections Tab
         self.connections_tab = ConnectionsTab(self.config_manager, self)
         self.tab_widget.addTab(self.connections_tab, "Connections")
         
-        # Query Chat Tab
-        self.query_chat_tab = QueryChatTab(self.config_manager, self)
-        self.tab_widget.addTab(self.query_chat_tab, "Query Chat")
+        # Tab index -> (attribute name, factory) for tabs not built yet
+        self._tab_factories = {}
+        for attr, title, factory in (
+            ("query_chat_tab", "Query Chat", self._create_query_chat_tab),
+            ("results_tab", "Results", self._create_results_tab),
+            ("history_tab", "History", self._create_history_tab)
+        ):
+            index = self.tab_widget.addTab(QWidget(), title)
+            self._tab_factories[index] = (attr, factory)
+        self.tab_widget.currentChanged.connect(self._ensure_tab)
+    
+    def _ensure_tab(self, index: int):
+        """Build the tab at index if it is still a placeholder"""
+        entry = self._tab_factories.pop(index, None)
+        if entry is None:
+            return
+        attr, factory = entry
+        widget = factory()
+        setattr(self, attr, widget)
         
-        # Results Tab
-        self.results_tab = ResultsTab(self.config_manager, self)
-        self.tab_widget.addTab(self.results_tab, "Results")
+        # Swap the placeholder out without re-entering this handler
+        placeholder = self.tab_widget.widget(index)
+        title = self.tab_widget.tabText(index)
+        was_current = self.tab_widget.currentIndex() == index
+        self.tab_widget.blockSignals(True)
+        try:
+            self.tab_widget.removeTab(index)
+            self.tab_widget.insertTab(index, widget, title)
+            if was_current:
+                self.tab_widget.setCurrentIndex(index)
+        finally:
+            self.tab_widget.blockSignals(False)
+        placeholder.deleteLater()
+    
+    def _create_query_chat_tab(self):
+        """Build the Query Chat tab"""
+        from .tabs.query_chat_tab import QueryChatTab
         
-        # History Tab
-        self.history_tab = HistoryTab(self.config_manager, self)
-        self.tab_widget.addTab(self.history_tab, "History")
+        # Query Chat pushes its results into the Results tab
+        for index, (attr, _) in list(self._tab_factories.items()):
+            if attr == "results_tab":
+                self._ensure_tab(index)
+        return QueryChatTab(self.config_manager, self)
+    
+    def _create_results_tab(self):
+        """Build the Results tab"""
+        from .tabs.results_tab import ResultsTab
+        return ResultsTab(self.config_manager, self)
+    
+    def _create_history_tab(self):
+        """Build the History tab"""
+        from .tabs.history_tab import HistoryTab
+        return HistoryTab(self.config_manager, self)
     
     def setup_menu(self):
         """Set up the application menu"""
@@ -146,28 +221,7 @@ class MainWindow(QMainWindow):
     
     def apply_theme(self, theme: str):
         """Apply UI theme"""
-        if theme == "dark":
-            self.setStyleSheet("""
-                QMainWindow {
-                    background-color: #2b2b2b;
-                    color: #ffffff;
-                }
-                QTabWidget::pane {
-                    border: 1px solid #555555;
-                    background-color: #3c3c3c;
-                }
-                QTabBar::tab {
-                    background-color: #2b2b2b;
-                    color: #ffffff;
-                    padding: 8px 16px;
-                    border: 1px solid #555555;
-                }
-                QTabBar::tab:selected {
-                    background-color: #3c3c3c;
-                }
-            """)
-        else:
-            self.setStyleSheet("")  # Default light theme
+        self._set_stylesheet(_DARK_QSS if theme == "dark" else _LIGHT_QSS)
     
     def apply_font_size(self, font_size: int):
         """Apply font size to application"""
@@ -178,28 +232,29 @@ class MainWindow(QMainWindow):
     def load_stylesheet(self):
         """Load and apply the enhanced stylesheet"""
         try:
-            # Try enhanced stylesheet first
-            style_path = Path(__file__).parent / "style_enhanced.qss"
-            if style_path.exists():
-                with open(style_path, 'r', encoding='utf-8') as f:
-                    stylesheet = f.read()
-                self.setStyleSheet(stylesheet)
-                self.logger.info("Enhanced stylesheet loaded successfully")
-            else:
-                # Fallback to original stylesheet
-                style_path = Path(__file__).parent / "style.qss"
-                if style_path.exists():
-                    with open(style_path, 'r', encoding='utf-8') as f:
-                        stylesheet = f.read()
-                    self.setStyleSheet(stylesheet)
-                    self.logger.info("Fallback stylesheet loaded successfully")
-                else:
-                    self.logger.warning("No stylesheet file found")
+            # Try enhanced stylesheet first, then the original one
+            for file_name, label in (("style_enhanced.qss", "Enhanced"), ("style.qss", "Fallback")):
+                style_path = Path(__file__).parent / file_name
+                try:
+                    mtime = style_path.stat().st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                self._set_stylesheet(_read_stylesheet(str(style_path), mtime))
+                self.logger.info(f"{label} stylesheet loaded successfully")
+                return
+            self.logger.warning("No stylesheet file found")
         except Exception as e:
             self.logger.warning(f"Failed to load stylesheet: {e}")
     
+    def _set_stylesheet(self, stylesheet: str):
+        """Apply a stylesheet unless it is already applied, sparing Qt a re-parse"""
+        if stylesheet != self.styleSheet():
+            self.setStyleSheet(stylesheet)
+    
     def new_connection(self):
         """Handle new connection action"""
+        from .dialogs.connection_dialog import ConnectionDialog
+        
         dialog = ConnectionDialog(self.config_manager, parent=self)
         if dialog.exec() == QDialog.Accepted:
             # Refresh the connections tab
@@ -254,14 +309,4 @@ class MainWindow(QMainWindow):
         """Handle window close event"""
         self.logger.info("Application closing")
         
-        # Stop server thread if running
-        if hasattr(self, 'server_thread') and self.server_thread and self.server_thread.isRunning():
-            self.logger.info("Stopping gRPC server thread!")
-            # Try graceful shutdown first
-            if hasattr(self.server_thread, 'stop_server'):
-                self.server_thread.stop_server()
-            # Then terminate the thread
-            self.server_thread.terminate()
-            self.server_thread.wait(5000)  # Wait up to 5 seconds for clean shutdown
-            
         event.accept()
@@ -2,9 +2,24 @@
 UI Tab components for InsightPilot
 """
 
-from .connections_tab import ConnectionsTab
-from .query_chat_tab import QueryChatTab
-from .results_tab import ResultsTab
-from .history_tab import HistoryTab
+import importlib
+
+# Tab classes are imported on first access, so importing one tab module
+# doesn't load the others and their dependencies
+_TAB_MODULES = {
+    'ConnectionsTab': '.connections_tab',
+    'QueryChatTab': '.query_chat_tab',
+    'ResultsTab': '.results_tab',
+    'HistoryTab': '.history_tab'
+}
 
 __all__ = ['ConnectionsTab', 'QueryChatTab', 'ResultsTab', 'HistoryTab']
+
+
+def __getattr__(name):
+    module = _TAB_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -11,7 +11,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt
 
 # Import the connection test thread from the dialog
-from ..dialogs.connection_dialog import ConnectionTestThread, ConnectionDialog
+from ..dialogs.connection_dialog import ConnectionTestTask, ConnectionDialog, prewarm_drivers
 from ..dialogs.llm_connection_dialog import LLMConnectionDialog
 from llm.llm_service import LLMService
 
@@ -24,11 +24,16 @@ class ConnectionsTab(QWidget):
         self.config_manager = config_manager
         self.logger = logging.getLogger(__name__)
         self.test_thread = None
+        self.test_task = None
         self.llm_service = LLMService()
         self.llm_startup_thread = None
         
         self.setup_ui()
         self.load_connections()
+        
+        # Tests can be run from this tab without opening a dialog, so start
+        # importing the database drivers as soon as the tab exists
+        prewarm_drivers()
     
     def setup_ui(self):
         """Set up the connections tab UI"""
@@ -282,6 +287,9 @@ class ConnectionsTab(QWidget):
                 # Update status in table
                 self.connections_table.setItem(current_row, 4, QTableWidgetItem("Testing!"))
                 
+                def on_result(success, message):
+                    self.on_test_result(current_row, success, message)
+                
                 # Start appropriate connection test
                 if connection_type == 'LLM':
                     # Import here to avoid circular imports
@@ -290,13 +298,12 @@ class ConnectionsTab(QWidget):
                     # Extract provider type from config
                     provider_type = config.get('provider', 'ollama')
                     self.test_thread = LLMTestThread(config, provider_type)
+                    self.test_thread.result_ready.connect(on_result)
+                    self.test_thread.start()
                 else:
-                    self.test_thread = ConnectionTestThread(config)
-                
-                self.test_thread.result_ready.connect(
-                    lambda success, message: self.on_test_result(current_row, success, message)
-                )
-                self.test_thread.start()
+                    self.test_task = ConnectionTestTask(config)
+                    self.test_task.signals.result_ready.connect(on_result)
+                    ConnectionTestTask.thread_pool().start(self.test_task)
             else:
                 QMessageBox.warning(
                     self,
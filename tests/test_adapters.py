@@ -6,7 +6,7 @@ import pytest
 import unittest.mock as mock
 from adapters.base_adapter import BaseDBAdapter, DBConnection, QueryResult
 from adapters.mysql_adapter import MySQLAdapter
-from adapters.oracle_adapter import OracleAdapter
+from adapters.oracle_adapter import OracleAdapter, oracle_dsn
 from adapters.mongo_adapter import MongoAdapter
 
 
@@ -178,6 +178,12 @@ class TestOracleAdapter:
         assert result is True
         assert self.adapter._connected is True
         mock_connect.assert_called_once()
+        assert mock_connect.call_args.kwargs['dsn'] == "localhost:1521/ORCL"
+    
+    def test_dsn_defaults_to_xe_service(self):
+        """Test a connection without a service name targets XE, as the connection test does"""
+        assert oracle_dsn("localhost", 1521) == "localhost:1521/XE"
+        assert oracle_dsn("localhost", 1521, "") == "localhost:1521/XE"
     
     def test_validate_query_safe(self):
         """Test query validation for safe queries"""
@@ -3,6 +3,7 @@ Tests for LLM client functionality
 """
 
 import pytest
+import requests
 import unittest.mock as mock
 from llm.llm_client import LLMClient, LLMResponse
 from llm.prompt_builder import PromptBuilder
@@ -16,7 +17,7 @@ class TestLLMClient:
         """Set up test fixtures"""
         self.client = LLMClient(host="localhost", port=11434, model="mistral:7b")
     
-    @mock.patch('llm.llm_client.requests.get')
+    @mock.patch('llm.llm_client.requests.Session.get')
     def test_health_check_success(self, mock_get):
         """Test successful health check"""
         mock_response = mock.Mock()
@@ -28,7 +29,7 @@ class TestLLMClient:
         assert result is True
         mock_get.assert_called_once_with("http://localhost:11434/api/tags", timeout=5)
     
-    @mock.patch('llm.llm_client.requests.get')
+    @mock.patch('llm.llm_client.requests.Session.get')
     def test_health_check_failure(self, mock_get):
         """Test health check failure"""
         mock_get.side_effect = Exception("Connection failed")
@@ -37,7 +38,7 @@ class TestLLMClient:
         
         assert result is False
     
-    @mock.patch('llm.llm_client.requests.post')
+    @mock.patch('llm.llm_client.requests.Session.post')
     def test_generate_success(self, mock_post):
         """Test successful LLM generation"""
         mock_response = mock.Mock()
@@ -55,7 +56,7 @@ class TestLLMClient:
         assert result.model == "mistral:7b"
         mock_post.assert_called_once()
     
-    @mock.patch('llm.llm_client.requests.post')
+    @mock.patch('llm.llm_client.requests.Session.post')
     def test_generate_failure(self, mock_post):
         """Test LLM generation failure"""
         mock_post.side_effect = Exception("Request failed")
@@ -78,6 +79,26 @@ class TestLLMClient:
             assert result is True
             assert self.client.model == new_model
     
+    def test_calls_share_injected_session(self):
+        """Test every call goes through the session passed to the client"""
+        session = mock.Mock()
+        session.get.return_value.status_code = 200
+        client = LLMClient(host="localhost", port=11434, model="mistral:7b", session=session)
+        
+        client.health_check()
+        client.list_models()
+        client.generate("Generate a SQL query")
+        
+        assert session.get.call_count == 2
+        session.post.assert_called_once()
+    
+    @mock.patch('llm.llm_client.requests.Session.get')
+    def test_fetch_models_unreachable(self, mock_get):
+        """Test fetch_models reports an unreachable server as None"""
+        mock_get.side_effect = requests.ConnectionError("Connection refused")
+        
+        assert self.client.fetch_models() is None
+    
     def test_update_parameters(self):
         """Test parameter update"""
         new_params = {"temperature": 0.5, "max_tokens": 500}
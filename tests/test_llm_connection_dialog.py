@@ -0,0 +1,96 @@
+"""
+Tests for the LLM connection dialog's provider cache and Ollama test
+"""
+
+import logging
+import pytest
+import unittest.mock as mock
+from PySide6.QtNetwork import QNetworkReply
+from ui.dialogs.llm_connection_dialog import LLMConnectionDialog, OllamaConnectionTest
+
+
+class TestProviderCache:
+    """Test cached test providers are released when forgotten"""
+
+    def setup_method(self):
+        """Set up a dialog stand-in holding two cached providers"""
+        self.providers = [mock.Mock(), mock.Mock()]
+        self.dialog = mock.Mock(
+            _provider_cache={('openai', 'a', 'k'): self.providers[0], ('openai', 'b', 'k'): self.providers[1]},
+            logger=logging.getLogger(__name__)
+        )
+
+    def test_forget_providers_closes_each_provider(self):
+        """Test every cached provider is closed before the cache is cleared"""
+        LLMConnectionDialog._forget_providers(self.dialog)
+
+        assert self.dialog._provider_cache == {}
+        for provider in self.providers:
+            provider.close.assert_called_once_with()
+
+    def test_forget_providers_survives_close_errors(self):
+        """Test one provider failing to close does not stop the others"""
+        self.providers[0].close.side_effect = RuntimeError("boom")
+
+        LLMConnectionDialog._forget_providers(self.dialog)
+
+        assert self.dialog._provider_cache == {}
+        self.providers[1].close.assert_called_once_with()
+
+
+class TestOllamaConnectionTest:
+    """Test the Qt-driven Ollama connection test"""
+
+    def setup_method(self):
+        """Set up a quick test whose model listing has been sent"""
+        self.test = OllamaConnectionTest({'host': 'localhost', 'port': 11434, 'model': 'mistral:7b'},
+                                         mock.Mock(), quick_test=True)
+        self.results = []
+        self.test.result_ready.connect(lambda success, message: self.results.append((success, message)))
+        self.test._running = True
+
+    def _finish_tags(self, body):
+        """Deliver a successful /api/tags reply with the given body"""
+        reply = mock.Mock()
+        reply.error.return_value = QNetworkReply.NoError
+        reply.readAll.return_value = body
+        self.test._tags_reply = reply
+        self.test._on_tags_finished()
+
+    @pytest.mark.parametrize("body", [b'[]', b'{"models": [{"id": "mistral:7b"}]}', b'{"models": [1]}'])
+    def test_unexpected_tags_reply_finishes_test(self, body):
+        """Test valid JSON of the wrong shape fails the test instead of leaving it running"""
+        self._finish_tags(body)
+
+        assert self.test.isRunning() is False
+        assert len(self.results) == 1
+        assert self.results[0][0] is False
+
+    def test_quick_test_passes_with_model_listed(self):
+        """Test a listing containing the model passes a quick test"""
+        self._finish_tags(b'{"models": [{"name": "mistral:7b"}]}')
+
+        assert self.test.isRunning() is False
+        assert self.results == [(True, "Ollama server and model OK (generation skipped).")]
+
+
+class TestModelLoading:
+    """Test model listing reuses the dialog's cached providers"""
+
+    def setup_method(self):
+        """Set up a dialog stand-in with an API key and no cached providers"""
+        self.dialog = mock.Mock(_provider_cache={})
+        self.dialog.api_key_edit.text.return_value = "sk-test"
+        self.dialog._current_base_url.return_value = "https://api.openai.com/v1"
+        self.dialog._model_choices.return_value = ["gpt-4o-mini"]
+
+    @mock.patch('ui.dialogs.llm_connection_dialog.QMessageBox')
+    @mock.patch('ui.dialogs.llm_connection_dialog.OpenAIProvider')
+    def test_openai_models_use_cached_provider(self, mock_provider_class, _):
+        """Test loading models caches the provider so forgetting it closes its session"""
+        LLMConnectionDialog._load_openai_models(self.dialog, refresh=True)
+        LLMConnectionDialog._load_openai_models(self.dialog, refresh=True)
+
+        assert mock_provider_class.call_count == 1
+        assert list(self.dialog._provider_cache.values()) == [mock_provider_class.return_value]
+        assert mock_provider_class.return_value.invalidate_cache.call_count == 2
@@ -0,0 +1,59 @@
+"""
+Tests for command line argument parsing
+"""
+
+import pytest
+from main import parse_arguments, DEFAULT_MODE, DEFAULT_PORT
+
+
+class TestParseArguments:
+    """Test parse_arguments follows argparse semantics"""
+
+    def test_defaults(self):
+        """Test no arguments gives the defaults"""
+        args = parse_arguments([])
+
+        assert args.mode == DEFAULT_MODE
+        assert args.port == DEFAULT_PORT
+        assert args.config is None
+        assert args.debug is False
+
+    def test_separate_and_inline_values(self):
+        """Test values are accepted both as the next token and after '='"""
+        args = parse_arguments(["--mode", "server", "--port=9000", "--config", "app.json", "--debug"])
+
+        assert args.mode == "server"
+        assert args.port == 9000
+        assert args.config == "app.json"
+        assert args.debug is True
+
+    def test_empty_inline_value_does_not_take_next_token(self):
+        """Test '--config=' sets an empty value instead of consuming the next token"""
+        args = parse_arguments(["--config=", "--debug"])
+
+        assert args.config == ""
+        assert args.debug is True
+
+    def test_option_is_not_taken_as_value(self, capsys):
+        """Test a following option is not consumed as a flag's value"""
+        with pytest.raises(SystemExit) as exc_info:
+            parse_arguments(["--config", "--debug"])
+
+        assert exc_info.value.code == 2
+        assert "argument --config: expected one argument" in capsys.readouterr().err
+
+    def test_debug_rejects_explicit_value(self, capsys):
+        """Test '--debug=...' is rejected rather than treated as --debug"""
+        with pytest.raises(SystemExit) as exc_info:
+            parse_arguments(["--debug=no"])
+
+        assert exc_info.value.code == 2
+        assert "ignored explicit argument 'no'" in capsys.readouterr().err
+
+    def test_invalid_port(self, capsys):
+        """Test a non-integer port is rejected"""
+        with pytest.raises(SystemExit) as exc_info:
+            parse_arguments(["--port", "abc"])
+
+        assert exc_info.value.code == 2
+        assert "invalid int value: 'abc'" in capsys.readouterr().err
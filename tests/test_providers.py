@@ -0,0 +1,636 @@
+"""
+Tests for external LLM provider implementations
+"""
+
+import gzip
+import json
+import pytest
+import requests
+import unittest.mock as mock
+from concurrent.futures import Future
+from llm.providers.base_provider import LLMConfig, LLMResponse
+from llm.providers.ollama_provider import OllamaProvider
+from llm.providers.github_copilot_provider import GitHubCopilotProvider
+from llm.providers.openai_provider import OpenAIProvider
+from llm.providers.http_session import RateLimitError, build_session, parse_retry_after, raise_for_status
+
+
+def make_stream_response(lines, status_code=200):
+    """Build a mock streaming response usable as a context manager"""
+    response = mock.MagicMock(spec=requests.Response)
+    response.status_code = status_code
+    response.iter_lines.return_value = lines
+    response.__enter__.return_value = response
+    return response
+
+
+class TestOllamaProvider:
+    """Test Ollama provider functionality"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        config = LLMConfig(provider="ollama", model="mistral:7b", base_url="http://localhost:11434")
+        self.provider = OllamaProvider(config)
+        self.chunks = [
+            json.dumps({"model": "mistral:7b", "response": "SELECT ", "done": False}).encode(),
+            b"",
+            json.dumps({"model": "mistral:7b", "response": "1", "done": False}).encode(),
+            json.dumps({"model": "mistral:7b", "response": "", "done": True,
+                        "prompt_eval_count": 10, "eval_count": 2}).encode(),
+        ]
+
+    @mock.patch('llm.providers.ollama_provider.requests.post')
+    def test_generate_collects_stream(self, mock_post):
+        """Test generate assembles NDJSON chunks into one response"""
+        mock_post.return_value = make_stream_response(self.chunks)
+
+        result = self.provider.generate("Generate a SQL query")
+
+        assert result.success is True
+        assert result.content == "SELECT 1"
+        assert result.model == "mistral:7b"
+        assert result.tokens_used == 12
+        assert json.loads(mock_post.call_args.kwargs["data"])["stream"] is True
+
+    @mock.patch('llm.providers.ollama_provider.requests.post')
+    def test_generate_stream_yields_tokens(self, mock_post):
+        """Test generate_stream yields text as chunks arrive"""
+        mock_post.return_value = make_stream_response(self.chunks)
+
+        assert list(self.provider.generate_stream("Generate a SQL query")) == ["SELECT ", "1"]
+
+    @mock.patch('llm.providers.ollama_provider.requests.post')
+    def test_generate_stream_error_chunk(self, mock_post):
+        """Test an error chunk mid-stream fails the generation"""
+        mock_post.return_value = make_stream_response([json.dumps({"error": "model not found"}).encode()])
+
+        result = self.provider.generate("Generate a SQL query")
+
+        assert result.success is False
+        assert result.error == "model not found"
+
+    @mock.patch('llm.providers.ollama_provider.requests.post')
+    def test_generate_round_robins_hosts(self, mock_post):
+        """Test generations rotate across every configured base_url"""
+        config = LLMConfig(provider="ollama", model="mistral:7b",
+                           base_url=["http://gpu1:11434", "http://gpu2:11434"])
+        provider = OllamaProvider(config)
+        mock_post.side_effect = lambda *args, **kwargs: make_stream_response(self.chunks)
+
+        for _ in range(3):
+            provider.generate("Generate a SQL query")
+
+        urls = [call.args[0] for call in mock_post.call_args_list]
+        assert urls == ["http://gpu1:11434/api/generate", "http://gpu2:11434/api/generate",
+                        "http://gpu1:11434/api/generate"]
+        assert provider.base_url == "http://gpu1:11434"
+
+    def test_base_url_list_only_for_ollama(self):
+        """Test other providers reject several base URLs and a one-element list is unwrapped"""
+        with pytest.raises(ValueError):
+            LLMConfig(provider="openai", model="gpt-4o-mini", base_url=["http://a/v1", "http://b/v1"])
+
+        config = LLMConfig(provider="openai", model="gpt-4o-mini", base_url=["http://a/v1"])
+        assert config.base_url == "http://a/v1"
+        assert LLMConfig(provider="ollama", model="mistral:7b", base_url=[]).base_url is None
+
+    def test_generate_batch_preserves_order(self):
+        """Test generate_batch returns one response per prompt in order"""
+        self.provider.config.additional_params = {"parallel": 2}
+
+        with mock.patch.object(self.provider, 'generate') as mock_generate:
+            mock_generate.side_effect = lambda prompt, **kwargs: LLMResponse(content=prompt.upper(), success=True)
+
+            results = self.provider.generate_batch(["a", "b", "c"])
+
+        assert [r.content for r in results] == ["A", "B", "C"]
+
+    @mock.patch('llm.providers.ollama_provider.requests.get')
+    def test_list_models_served_from_cache(self, mock_get):
+        """Test list_models reuses the cached listing within the TTL"""
+        mock_response = mock.Mock()
+        mock_response.content = b'{"models": [{"name": "mistral:7b"}]}'
+        mock_get.return_value = mock_response
+
+        first = self.provider.list_models()
+        second = self.provider.list_models()
+
+        assert first == second == {"models": [{"name": "mistral:7b"}]}
+        mock_get.assert_called_once()
+
+    def test_stale_cache_refreshes_in_background(self):
+        """Test a stale entry is returned immediately and refreshed asynchronously"""
+        fetch = mock.Mock(side_effect=[1, 2])
+        self.provider.CACHE_TTL = 0.0
+
+        with mock.patch('llm.providers.base_provider.threading.Thread') as mock_thread:
+            assert self.provider._cached_call("key", fetch) == 1
+            assert self.provider._cached_call("key", fetch) == 1
+
+        mock_thread.assert_called_once()
+        self.provider._refresh_cached("key", fetch)
+        self.provider.CACHE_TTL = 60.0
+        assert self.provider._cached_call("key", fetch) == 2
+
+    def test_update_parameters(self):
+        """Test known fields update the config and others go to additional_params"""
+        self.provider.update_parameters(temperature=0.5, num_ctx=4096)
+
+        assert self.provider.config.temperature == 0.5
+        assert self.provider.config.additional_params == {"num_ctx": 4096}
+
+    def test_generate_sql_template_fast_path(self):
+        """Test canonical row-count questions skip the LLM"""
+        schema_info = "\n### TABLE: users ###\nColumns:\n  - id (int)\n"
+
+        with mock.patch.object(self.provider, 'generate') as mock_generate:
+            result = self.provider.generate_sql(schema_info, "How many rows are in the Users table?")
+
+        assert result.success is True
+        assert result.provider == "template"
+        assert result.content == "SELECT COUNT(*) AS row_count FROM users"
+        mock_generate.assert_not_called()
+
+    @pytest.mark.parametrize("table", ["order", "user", "group", "Users", "ORDERS"])
+    def test_generate_sql_template_skips_names_needing_quotes(self, table):
+        """Test reserved words and mixed- or upper-case table names go to the LLM"""
+        schema_info = f"\n### TABLE: {table} ###\n"
+
+        with mock.patch.object(self.provider, 'generate') as mock_generate:
+            mock_generate.return_value = LLMResponse(content="SELECT 1", success=True)
+            result = self.provider.generate_sql(schema_info, f"count rows in {table.lower()}")
+
+        assert result.provider != "template"
+        mock_generate.assert_called_once()
+
+    def test_generate_sql_unknown_table_uses_llm(self):
+        """Test template matching requires the table to exist in the schema"""
+        schema_info = "\n### TABLE: users ###\n"
+
+        with mock.patch.object(self.provider, 'generate') as mock_generate:
+            mock_generate.return_value = LLMResponse(content="SELECT 1", success=True)
+            self.provider.generate_sql(schema_info, "count rows in orders")
+
+        mock_generate.assert_called_once()
+
+
+class TestGitHubCopilotProvider:
+    """Test GitHub Copilot provider functionality"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        config = LLMConfig(provider="github_copilot", model="gpt-4o", api_key="ghp_test")
+        self.provider = GitHubCopilotProvider(config)
+        self.events = [
+            'data: {"model": "gpt-4o", "choices": [{"delta": {"role": "assistant"}}]}',
+            '',
+            'data: {"model": "gpt-4o", "choices": [{"delta": {"content": "SELECT "}}]}',
+            'data: {"model": "gpt-4o", "choices": [{"delta": {"content": "1"}}]}',
+            'data: {"model": "gpt-4o", "choices": [], "usage": {"total_tokens": 42}}',
+            'data: [DONE]',
+        ]
+
+    @mock.patch('requests.Session.post')
+    def test_generate_collects_stream(self, mock_post):
+        """Test generate assembles SSE deltas into one response"""
+        mock_post.return_value = make_stream_response(self.events)
+
+        result = self.provider.generate("Generate a SQL query")
+
+        assert result.success is True
+        assert result.content == "SELECT 1"
+        assert result.tokens_used == 42
+
+    @mock.patch('requests.Session.post')
+    def test_generate_stream_yields_tokens(self, mock_post):
+        """Test generate_stream yields deltas and stops at [DONE]"""
+        mock_post.return_value = make_stream_response(self.events)
+
+        assert list(self.provider.generate_stream("Generate a SQL query")) == ["SELECT ", "1"]
+
+    @mock.patch('requests.Session.post')
+    def test_generate_maps_http_errors(self, mock_post):
+        """Test HTTP error statuses map to user-facing messages"""
+        mock_post.return_value = make_stream_response([], status_code=401)
+
+        result = self.provider.generate("Generate a SQL query")
+
+        assert result.success is False
+        assert "access denied" in result.error
+
+    def test_serialized_body_is_valid_json(self):
+        """Test the spliced request body decodes to the full chat payload"""
+        params = self.provider._build_params(temperature=0.2)
+
+        payload = json.loads(self.provider._serialize_body('say "hi"', params))
+
+        assert payload["stream"] is True
+        assert payload["messages"][0] == self.provider._system_message
+        assert payload["messages"][1] == {"role": "user", "content": 'say "hi"'}
+        assert payload["model"] == "gpt-4o"
+        assert payload["temperature"] == 0.2
+
+    @mock.patch('requests.Session.post')
+    def test_large_prompt_compression_falls_back_on_415(self, mock_post):
+        """Test large bodies are compressed and sent plain after a 415"""
+        self.provider._request_encoding = "gzip"
+        mock_post.side_effect = [make_stream_response([], status_code=415), make_stream_response(self.events)]
+
+        result = self.provider.generate("x" * 10000)
+
+        assert result.success is True
+        first, second = mock_post.call_args_list
+        assert first.kwargs["headers"]["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(first.kwargs["data"]))["messages"][1]["content"] == "x" * 10000
+        assert "Content-Encoding" not in second.kwargs["headers"]
+        assert self.provider._request_encoding is None
+
+    @mock.patch('requests.Session.post')
+    def test_large_prompt_compression_falls_back_on_400(self, mock_post):
+        """Test a compressed body rejected with 400 is resent plain and compression turned off"""
+        self.provider._request_encoding = "gzip"
+        mock_post.side_effect = [make_stream_response([], status_code=400), make_stream_response(self.events)]
+
+        result = self.provider.generate("x" * 10000)
+
+        assert result.success is True
+        first, second = mock_post.call_args_list
+        assert first.kwargs["headers"]["Content-Encoding"] == "gzip"
+        assert "Content-Encoding" not in second.kwargs["headers"]
+        assert json.loads(second.kwargs["data"])["messages"][1]["content"] == "x" * 10000
+        assert self.provider._request_encoding is None
+
+    @mock.patch('requests.Session.post')
+    def test_plain_400_keeps_compression(self, mock_post):
+        """Test a 400 that recurs uncompressed is reported and compression stays on"""
+        self.provider._request_encoding = "gzip"
+        mock_post.side_effect = [make_stream_response([], status_code=400), make_stream_response([], status_code=400)]
+
+        result = self.provider.generate("x" * 10000)
+
+        assert result.success is False
+        assert mock_post.call_count == 2
+        assert self.provider._request_encoding == "gzip"
+
+    @mock.patch('requests.Session.head')
+    @mock.patch('requests.Session.get')
+    def test_warm_up_connects_to_chat_endpoint(self, mock_get, mock_head):
+        """Test warm_up validates the token and opens the host generation posts to"""
+        mock_get.return_value = mock.Mock(status_code=200, content=b'{"login": "octocat"}')
+
+        self.provider.warm_up()
+
+        assert mock_get.call_args.args[0] == "https://api.github.com/user"
+        assert mock_head.call_args.args[0].startswith("https://models.inference.ai.azure.com/")
+
+    def test_chat_posts_are_not_replayed(self):
+        """Test the session retries 429s and failed connects, never 5xx or read timeouts"""
+        retry = self.provider._session.get_adapter("https://models.inference.ai.azure.com").max_retries
+
+        assert tuple(retry.status_forcelist) == (429,)
+        assert retry.read == 0
+
+    @mock.patch('requests.Session.get')
+    def test_token_validation_is_memoized(self, mock_get):
+        """Test a successful token validation is reused within the TTL"""
+        mock_response = mock.Mock()
+        mock_response.status_code = 200
+        mock_response.content = b'{"login": "octocat"}'
+        mock_get.return_value = mock_response
+
+        assert self.provider.health_check() is True
+        assert self.provider.validate_token() is True
+        assert self.provider.health_check() is True
+        mock_get.assert_called_once()
+
+
+
+class TestOpenAIProvider:
+    """Test OpenAI provider functionality"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        config = LLMConfig(provider="openai", model="gpt-4o-mini", api_key="sk-test")
+        self.provider = OpenAIProvider(config)
+
+    def teardown_method(self):
+        """Release provider resources"""
+        self.provider.close()
+
+    @mock.patch('requests.Session.post')
+    def test_generate_success(self, mock_post):
+        """Test successful generation over the shared session"""
+        mock_response = mock.Mock()
+        mock_response.content = json.dumps({
+            "model": "gpt-4o-mini",
+            "choices": [{"message": {"content": "SELECT 1"}}],
+            "usage": {"total_tokens": 15}
+        }).encode()
+        mock_post.return_value = mock_response
+
+        result = self.provider.generate("Generate a SQL query")
+
+        assert result.success is True
+        assert result.content == "SELECT 1"
+        assert result.tokens_used == 15
+        assert self.provider._session.headers["Authorization"] == "Bearer sk-test"
+
+    def test_completion_posts_are_not_replayed(self):
+        """Test the chat session retries 429s and failed connects, never 5xx or read timeouts"""
+        retry = self.provider._session.get_adapter("https://api.openai.com").max_retries
+
+        assert tuple(retry.status_forcelist) == (429,)
+        assert retry.read == 0
+
+    @mock.patch('requests.Session.post')
+    def test_generate_reports_retry_after(self, mock_post):
+        """Test a final 429 returns a failed response carrying the server's Retry-After"""
+        mock_post.return_value = mock.Mock(status_code=429, headers={"Retry-After": "20"})
+
+        result = self.provider.generate("Generate a SQL query")
+
+        assert result.success is False
+        assert result.retry_after == 20.0
+        assert "retry after 20s" in result.error
+
+    def test_generate_joins_inflight_request(self):
+        """Test a duplicate prompt waits for the in-flight request instead of sending another"""
+        shared = LLMResponse(content="SELECT 1", success=True)
+        future = Future()
+        future.set_result(shared)
+        self.provider._inflight[("gpt-4o-mini", "same prompt", ())] = future
+
+        with mock.patch.object(self.provider, '_request_completion') as mock_request:
+            assert self.provider.generate("same prompt") is shared
+            mock_request.assert_not_called()
+
+    def test_generate_clears_inflight_entry(self):
+        """Test the in-flight table is emptied once a request completes"""
+        with mock.patch.object(self.provider, '_request_completion',
+                               return_value=LLMResponse(content="SELECT 1", success=True)):
+            self.provider.generate("Generate a SQL query")
+
+        assert self.provider._inflight == {}
+
+    @mock.patch('requests.Session.post')
+    def test_generate_stream_yields_deltas_and_returns_response(self, mock_post):
+        """Test streamed deltas are yielded and usage lands in the final response"""
+        mock_post.return_value = make_stream_response([
+            'data: {"model": "gpt-4o-mini", "choices": [{"delta": {"content": "SELECT "}}]}',
+            'data: {"choices": [{"delta": {"content": "1"}}]}',
+            'data: {"choices": [], "usage": {"total_tokens": 12}}',
+            'data: [DONE]',
+        ])
+
+        stream = self.provider.generate_stream("Generate a SQL query")
+        chunks = []
+        with pytest.raises(StopIteration) as stop:
+            while True:
+                chunks.append(next(stream))
+
+        assert chunks == ["SELECT ", "1"]
+        assert stop.value.value.content == "SELECT 1"
+        assert stop.value.value.tokens_used == 12
+        payload = json.loads(mock_post.call_args.kwargs["data"])
+        assert payload["stream_options"] == {"include_usage": True}
+
+    @mock.patch('requests.Session.head')
+    def test_health_check_cached_until_invalidated(self, mock_head):
+        """Test health_check hits the network once until the cache is invalidated"""
+        mock_head.return_value = mock.Mock(status_code=200)
+
+        assert self.provider.health_check() is True
+        assert self.provider.health_check() is True
+        assert mock_head.call_count == 1
+
+        self.provider.update_parameters(api_key="sk-new")
+        assert self.provider.health_check() is True
+        assert mock_head.call_count == 2
+
+    @mock.patch('requests.Session.get')
+    @mock.patch('requests.Session.head')
+    def test_health_check_falls_back_to_streamed_get(self, mock_head, mock_get):
+        """Test health_check retries with a body-less GET when HEAD is rejected"""
+        mock_head.return_value = mock.Mock(status_code=405)
+        mock_get.return_value = make_stream_response([])
+
+        assert self.provider.health_check() is True
+        assert mock_get.call_args.kwargs["stream"] is True
+        mock_get.return_value.iter_lines.assert_not_called()
+
+    @mock.patch('requests.Session.get')
+    @mock.patch('requests.Session.head')
+    def test_health_check_falls_back_on_other_client_errors(self, mock_head, mock_get):
+        """Test a HEAD 404 from a proxy is retried with GET rather than reported as down"""
+        mock_head.return_value = mock.Mock(status_code=404)
+        mock_get.return_value = make_stream_response([])
+
+        assert self.provider.health_check() is True
+        assert mock_get.call_count == 1
+
+    @mock.patch('requests.Session.get')
+    @mock.patch('requests.Session.head')
+    def test_health_check_auth_failure_skips_fallback(self, mock_head, mock_get):
+        """Test a HEAD 401 is conclusive and no GET is sent"""
+        mock_head.return_value = mock.Mock(status_code=401)
+
+        assert self.provider.health_check() is False
+        mock_get.assert_not_called()
+
+    def test_wait_for_batch_orders_results(self):
+        """Test batch output lines are parsed and returned in submission order"""
+        output = "\n".join([
+            json.dumps({"custom_id": "1", "response": {"body": {"choices": [{"message": {"content": "B"}}]}}}),
+            json.dumps({"custom_id": "0", "response": {"body": {"choices": [{"message": {"content": "A"}}]}}}),
+            json.dumps({"custom_id": "2", "error": {"message": "rate limited"}}),
+        ])
+        content = mock.Mock(text=output)
+
+        with mock.patch.object(self.provider, 'poll_batch') as mock_poll, \
+                mock.patch('requests.Session.get', return_value=content):
+            mock_poll.return_value = {"status": "completed", "output_file_id": "file-out"}
+            results = self.provider.wait_for_batch("batch_1", poll_interval=0)
+
+        assert [r.content for r in results] == ["A", "B", ""]
+        assert results[2].success is False
+        assert results[0].response_time is None
+
+    def test_submit_batch_posts_are_not_replayed_on_5xx(self):
+        """Test batch uploads and job creation only retry 429s and failed connects"""
+        retry = self.provider._batch_session.get_adapter("https://api.openai.com").max_retries
+
+        assert tuple(retry.status_forcelist) == (429,)
+        assert retry.read == 0
+
+        with mock.patch.object(self.provider._batch_session, 'post') as mock_post, \
+                mock.patch.object(self.provider._session, 'post') as mock_shared_post:
+            mock_post.return_value.status_code = 200
+            mock_post.return_value.json.side_effect = [{"id": "file-in"}, {"id": "batch_1"}]
+            assert self.provider.submit_batch(["a"]) == "batch_1"
+
+        assert mock_post.call_count == 2
+        mock_shared_post.assert_not_called()
+
+    def test_wait_for_batch_fills_failed_requests(self):
+        """Test requests only in the error file, or in neither, keep their slot"""
+        files = {
+            "file-out": json.dumps({"custom_id": "0", "response": {"body": {"choices": [{"message": {"content": "A"}}]}}}),
+            "file-err": json.dumps({"custom_id": "2", "response": {"status_code": 500, "body": {"error": {"message": "boom"}}}}),
+        }
+
+        def fake_get(url, **kwargs):
+            return mock.Mock(text=files[url.split("/")[-2]])
+
+        with mock.patch.object(self.provider, 'poll_batch') as mock_poll, \
+                mock.patch('requests.Session.get', side_effect=fake_get):
+            mock_poll.return_value = {
+                "status": "completed",
+                "output_file_id": "file-out",
+                "error_file_id": "file-err",
+                "request_counts": {"total": 4}
+            }
+            results = self.provider.wait_for_batch("batch_1", poll_interval=0)
+
+        assert [r.success for r in results] == [True, False, False, False]
+        assert "boom" in results[2].error
+
+    def test_estimate_costs_matches_scalar_estimate(self):
+        """Test the vectorized estimate agrees with per-request estimates"""
+        tokens = [0, 1000, 12345]
+
+        costs = self.provider.estimate_costs(tokens, "gpt-4o")
+
+        assert costs.tolist() == [self.provider.estimate_cost(t, "gpt-4o") for t in tokens]
+        assert self.provider.estimate_costs(tokens, "unknown").tolist() == [0.0, 0.0, 0.0]
+
+    def test_estimate_cost_cached_input_discount(self):
+        """Test cached prompt tokens are billed at half the input price"""
+        full = self.provider.estimate_cost(10000, "gpt-4o")
+        cached = self.provider.estimate_cost(10000, "gpt-4o", cached_input_tokens=2000)
+
+        assert cached == pytest.approx(full - 2000 * 0.005 * 0.5 / 1000)
+
+    def test_build_payload_applies_overrides_and_config_updates(self):
+        """Test payload overrides are filtered and config updates refresh the template"""
+        payload = self.provider._build_payload("q", temperature=0.9, stream_hint=True)
+        assert payload["temperature"] == 0.9
+        assert "stream_hint" not in payload
+
+        self.provider.update_parameters(max_tokens=256)
+        assert self.provider._build_payload("q")["max_tokens"] == 256
+
+    @mock.patch('llm.providers.openai_provider.tiktoken', None)
+    def test_preflight_cost_without_tiktoken(self):
+        """Test preflight cost falls back to a length-based token estimate"""
+        assert self.provider.estimate_tokens("abcdefgh") == 2
+        assert self.provider.estimate_tokens("abcdefghi") == 3
+
+        input_tokens = self.provider.estimate_tokens(
+            self.provider._system_message["content"]
+        ) + 2
+        expected = (input_tokens * 0.00015 + 100 * 0.0006) / 1000
+        assert self.provider.preflight_cost("abcdefgh", 100) == pytest.approx(expected, abs=1e-6)
+
+    def test_system_prompt_is_stable(self):
+        """Test every payload shares the same long system prompt"""
+        first = self.provider._build_payload("a")["messages"][0]
+        second = self.provider._build_payload("b")["messages"][0]
+
+        assert first == second
+        # Roughly four characters per token; caching needs 1024+ tokens
+        assert len(first["content"]) > 4 * 1024
+
+    def test_estimate_cost_batch_discount(self):
+        """Test batch jobs are estimated at half price"""
+        full = self.provider.estimate_cost(10000, "gpt-4o")
+
+        assert self.provider.estimate_cost(10000, "gpt-4o", batch=True) == pytest.approx(full / 2)
+
+    def test_generate_many_preserves_order(self):
+        """Test generate_many returns one response per prompt in order"""
+        async def fake_agenerate(prompt, session=None, **kwargs):
+            return LLMResponse(content=prompt.upper(), success=True)
+
+        with mock.patch.object(self.provider, 'generate') as mock_generate, \
+                mock.patch.object(self.provider, 'agenerate', side_effect=fake_agenerate):
+            mock_generate.side_effect = lambda prompt, **kwargs: LLMResponse(content=prompt.upper(), success=True)
+
+            results = self.provider.generate_many(["a", "b", "c"], concurrency=2)
+
+        assert [r.content for r in results] == ["A", "B", "C"]
+
+    @mock.patch('requests.Session.post')
+    def test_generate_accepts_unhashable_kwargs(self, mock_post):
+        """Test list-valued options skip coalescing instead of raising"""
+        mock_post.return_value.content = json.dumps({
+            "choices": [{"message": {"content": "SELECT 1"}}]
+        }).encode()
+
+        result = self.provider.generate("q", stop=["a"], response_format={"type": "text"})
+
+        assert result.success is True
+        assert mock_post.call_count == 1
+
+    def test_update_model_changes_payload_model(self):
+        """Test update_model is reflected in the next request body"""
+        self.provider.update_model("gpt-4o")
+
+        assert self.provider._build_payload("q")["model"] == "gpt-4o"
+
+    @mock.patch('requests.Session.post')
+    def test_generate_multi_uses_one_request(self, mock_post):
+        """Test generate_multi packs prompts into one JSON-mode request"""
+        mock_response = mock.Mock()
+        mock_response.content = json.dumps({
+            "model": "gpt-4o-mini",
+            "choices": [{"message": {"content": json.dumps({"2": "SELECT 2", "1": "SELECT 1"})}}],
+            "usage": {"total_tokens": 31}
+        }).encode()
+        mock_post.return_value = mock_response
+
+        results = self.provider.generate_multi(["first", "second", "third"])
+
+        assert mock_post.call_count == 1
+        body = json.loads(mock_post.call_args.kwargs['data'])
+        assert body["response_format"] == {"type": "json_object"}
+        assert "1) first" in body["messages"][1]["content"]
+        assert [r.content for r in results[:2]] == ["SELECT 1", "SELECT 2"]
+        assert results[2].success is False
+        assert sum(r.tokens_used for r in results) == 31
+
+
+class TestHTTPSession:
+    """Test shared provider session construction"""
+
+    def test_build_session_retries_transient_errors(self):
+        """Test the mounted adapter retries 429/5xx with Retry-After"""
+        session = build_session(total_retries=5)
+        retry = session.get_adapter("https://api.example.com").max_retries
+
+        assert retry.total == 5
+        assert 429 in retry.status_forcelist
+        assert "POST" in retry.allowed_methods
+        assert retry.respect_retry_after_header is True
+
+    def test_raise_for_status_reports_retry_after(self):
+        """Test a final 429 raises RateLimitError carrying the Retry-After delay"""
+        response = mock.MagicMock(spec=requests.Response)
+        response.status_code = 429
+        response.headers = {"Retry-After": "20"}
+
+        with pytest.raises(RateLimitError) as error:
+            raise_for_status(response)
+
+        assert error.value.retry_after == 20.0
+        assert error.value.response is response
+
+    def test_parse_retry_after_formats(self):
+        """Test Retry-After parsing for seconds, HTTP dates and junk"""
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])